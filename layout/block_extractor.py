@@ -1,42 +1,81 @@
 import cv2
 import numpy as np
 import os
-from paddleocr import PaddleOCR
+from concurrent.futures import ThreadPoolExecutor
 
-ocr = PaddleOCR(lang="en")   # detector + recognizer
+from ocr.paddle_ocr_engine import get_ocr, load_images
 
+# PNG encode + write happen here so cropping is not blocked on disk
+_IO_POOL = ThreadPoolExecutor(max_workers=4)
 
-def extract_blocks(image_path, output_folder):
-    os.makedirs(output_folder, exist_ok=True)
-
-    img = cv2.imread(image_path)
-    if img is None:
-        print("[ERROR] cannot load:", image_path)
-        return []
-
-    result = ocr.ocr(img, det=True, rec=False)  # only detect boxes
-    if not result or not result[0]:
-        print("[WARN] No text detected.")
-        return []
-
-    boxes = []
-    for line in result[0]:
-        box = np.array(line[0])
-        x1 = box[:,0].min()
-        y1 = box[:,1].min()
-        x2 = box[:,0].max()
-        y2 = box[:,1].max()
-        boxes.append([x1, y1, x2, y2])
-
-    # sort top to bottom
-    boxes.sort(key=lambda b: (b[1], b[0]))
+# Layout detection runs on a downscaled page; crops still come from full-res
+DET_SCALE = 0.5
+
+
+def _crop_blocks(img, detections, output_folder, det_scale=1.0):
+    # (N, 4, 2) polygons → (N, 4) [x1, y1, x2, y2] in one pass,
+    # mapped back from detection scale to full resolution
+    polys = np.asarray([line[0] for line in detections], dtype=np.float32) / det_scale
+    boxes = np.concatenate([polys.min(axis=1), polys.max(axis=1)], axis=1)
+
+    # sort top to bottom, then left to right
+    order = np.lexsort((boxes[:, 0], boxes[:, 1]))
+    boxes = boxes[order].astype(np.int32)
 
     images = []
+    writes = []
     for i, (x1, y1, x2, y2) in enumerate(boxes):
-        crop = img[int(y1):int(y2), int(x1):int(x2)]
+        crop = img[y1:y2, x1:x2]
 
         out = os.path.join(output_folder, f"block_{i+1}.png")
-        cv2.imwrite(out, crop)
+        writes.append(_IO_POOL.submit(cv2.imwrite, out, crop))
         images.append(out)
 
+    # every crop must be on disk before callers read the paths
+    for w in writes:
+        w.result()
+
     return images
+
+
+def extract_blocks_batch(image_paths, output_folders):
+    """
+    Detect text blocks on each (downscaled) page of a document
+    with a det-only PaddleOCR call, then crop at full resolution.
+
+    Returns one list of block image paths per page.
+    """
+    for folder in output_folders:
+        os.makedirs(folder, exist_ok=True)
+
+    imgs = load_images(image_paths)
+    blocks = [[] for _ in image_paths]
+
+    loaded = []
+    for i, (path, img) in enumerate(zip(image_paths, imgs)):
+        if img is None:
+            print("[ERROR] cannot load:", path)
+            continue
+        loaded.append(i)
+
+    if not loaded:
+        return blocks
+
+    ocr = get_ocr()   # detector + recognizer (loaded once per process)
+
+    for i in loaded:
+        small = cv2.resize(imgs[i], None, fx=DET_SCALE, fy=DET_SCALE, interpolation=cv2.INTER_AREA)
+
+        # one page per call: PaddleOCR 2.x exits on a list with det=True
+        result = ocr.ocr(small, det=True, rec=False)  # only detect boxes
+        if not result or not result[0]:
+            print("[WARN] No text detected:", image_paths[i])
+            continue
+
+        blocks[i] = _crop_blocks(imgs[i], result[0], output_folders[i], DET_SCALE)
+
+    return blocks
+
+
+def extract_blocks(image_path, output_folder):
+    return extract_blocks_batch([image_path], [output_folder])[0]
@@ -3,13 +3,15 @@
 import cv2
 import os
 
-def split_into_columns(image_path, output_folder):
-    os.makedirs(output_folder, exist_ok=True)
+# fastest PNG level — column images are re-read by OCR, not archived
+PNG_PARAMS = [cv2.IMWRITE_PNG_COMPRESSION, 1]
 
-    img = cv2.imread(image_path)
-    if img is None:
-        raise ValueError(f"Cannot load {image_path}")
 
+def split_into_columns_array(img):
+    """
+    Splits a page image into (left, right) column arrays.
+    Both are zero-copy views into img.
+    """
     h, w = img.shape[:2]
 
     # --- FINAL SOLID APPROACH ---
@@ -27,11 +29,35 @@ def split_into_columns(image_path, output_folder):
     left = img[:, :left_end]
     right = img[:, right_start:]
 
-    left_path = os.path.join(output_folder, "left.png")
-    right_path = os.path.join(output_folder, "right.png")
+    print(f"[COLUMN] Split at x={mid}")
+    return left, right
+
+
+def split_page(image_path, output_folder=None):
+    """
+    Loads a page image and splits it into [left, right] column arrays.
+    With output_folder set, the columns are also saved there as
+    left.png / right.png.
+    """
+    img = cv2.imread(image_path)
+    if img is None:
+        raise ValueError(f"Cannot load {image_path}")
+
+    columns = list(split_into_columns_array(img))
+
+    if output_folder is not None:
+        os.makedirs(output_folder, exist_ok=True)
+        for name, col in zip(("left.png", "right.png"), columns):
+            cv2.imwrite(os.path.join(output_folder, name), col, PNG_PARAMS)
+        print("[COLUMN] Saved left/right columns")
 
-    cv2.imwrite(left_path, left)
-    cv2.imwrite(right_path, right)
+    return columns
+
+
+def split_into_columns(image_path, output_folder):
+    split_page(image_path, output_folder)
 
-    print(f"[COLUMN] Split at x={mid}, saved left/right columns")
-    return [left_path, right_path]
+    return [
+        os.path.join(output_folder, "left.png"),
+        os.path.join(output_folder, "right.png"),
+    ]
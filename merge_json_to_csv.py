@@ -10,10 +10,77 @@ import csv
 import argparse
 import re
 import io
+import mmap
+import os
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import partial
+
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:  # fall back to per-keyword substring checks
+    ahocorasick = None
+
+
+# orjson decodes integers wider than 64 bits as floats; files with a
+# digit run this long are left to the stdlib, which keeps them exact
+_LONG_DIGITS_RE = re.compile(rb'\d{19}')
+
+
+def load_json_file(path: Path) -> Any:
+    """
+    Load a JSON file, memory-mapped and decoded with orjson when available.
+    
+    Raises:
+        json.JSONDecodeError (orjson.JSONDecodeError subclasses it)
+    """
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            # mmap cannot map an empty file; let orjson raise its decode error
+            if os.fstat(f.fileno()).st_size == 0:
+                return orjson.loads(b"")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if not _LONG_DIGITS_RE.search(mm):
+                    with memoryview(mm) as view:
+                        return orjson.loads(view)
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def dumps_json_line(data: Any) -> bytes:
+    """
+    Encode data as one compact UTF-8 JSON line (for NDJSON logs).
+    """
+    if orjson is None:
+        return json.dumps(data, ensure_ascii=False).encode('utf-8') + b"\n"
+    return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+
+
+def dump_json_file(data: Any, path: Path) -> None:
+    """
+    Write data as indented UTF-8 JSON (orjson when available).
+    """
+    if orjson is None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        return
+    
+    with open(path, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+
+
+_FN_RE = re.compile(r'^(.+?)_(\d{4})$')
+_YEAR_RE = re.compile(r'(\d{4})')
 
 
 def parse_filename(filename: str) -> tuple[Optional[str], Optional[int]]:
@@ -25,23 +92,21 @@ def parse_filename(filename: str) -> tuple[Optional[str], Optional[int]]:
         (exam_name, year) or (None, None) if parsing fails
     """
     # Remove .json extension
-    base = filename.replace('.json', '')
+    base = filename[:-5] if filename.endswith('.json') else filename
     
     # Try to match pattern: {Exam}_{Year}
-    match = re.match(r'^(.+?)_(\d{4})$', base)
+    match = _FN_RE.match(base)
     if match:
         exam = match.group(1)
         year = int(match.group(2))
         return exam, year
     
-    # Fallback: try to extract year from anywhere in filename
-    year_match = re.search(r'(\d{4})', base)
-    if year_match:
-        year = int(year_match.group(1))
-        # Remove year from base to get exam name
-        exam = re.sub(r'_\d{4}$', '', base)
-        if exam:
-            return exam, year
+    # Fallback: try to extract year from anywhere in filename.
+    # The pattern above failed, so there is no "_{Year}" suffix to strip
+    # unless the whole name is "_{Year}", which leaves no exam name.
+    year_match = _YEAR_RE.search(base)
+    if year_match and base != f"_{year_match.group(1)}":
+        return base, int(year_match.group(1))
     
     # If no year found, return exam only
     if base:
@@ -50,6 +115,60 @@ def parse_filename(filename: str) -> tuple[Optional[str], Optional[int]]:
     return None, None
 
 
+# Per-format indicator keywords (any one must appear) and the warning used when none do.
+# ("statement ii", "assertion (a)", "reason (r)" are covered by their shorter prefixes.)
+_FORMAT_KEYWORDS = {
+    "match": (
+        ("match", "row"),
+        "Match format declared but question doesn't contain match/pairing indicators"
+    ),
+    "statement": (
+        ("statement", "consider the following"),
+        "Statement format declared but question doesn't contain statement indicators"
+    ),
+    "assertion": (
+        ("assertion", "reason", "statement i"),
+        "Assertion format declared but question doesn't contain assertion/reason indicators"
+    ),
+    "table": (
+        ("table", "row", "column"),
+        "Table format declared but question doesn't contain table indicators"
+    ),
+}
+
+
+def _build_format_automaton():
+    """
+    Compile every format keyword into one Aho-Corasick automaton.
+    Each keyword maps to the set of formats it indicates ("row" → match, table).
+    """
+    if ahocorasick is None:
+        return None
+
+    formats_by_keyword: Dict[str, set] = {}
+    for fmt, (keywords, _) in _FORMAT_KEYWORDS.items():
+        for k in keywords:
+            formats_by_keyword.setdefault(k, set()).add(fmt)
+
+    automaton = ahocorasick.Automaton()
+    for k, formats in formats_by_keyword.items():
+        automaton.add_word(k, frozenset(formats))
+    automaton.make_automaton()
+    return automaton
+
+
+_FORMAT_AUTOMATON = _build_format_automaton()
+
+
+def _has_format_indicator(question_text: str, declared_format: str, keywords: Tuple[str, ...]) -> bool:
+    """True if any indicator keyword of declared_format appears in question_text."""
+    if _FORMAT_AUTOMATON is None:
+        return any(k in question_text for k in keywords)
+
+    # single pass over the text; stops at the first hit for this format
+    return any(declared_format in formats for _, formats in _FORMAT_AUTOMATON.iter(question_text))
+
+
 def validate_question_format(question: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
     """
     Validate if question structure matches its declared format type.
@@ -60,38 +179,28 @@ def validate_question_format(question: Dict[str, Any]) -> Tuple[bool, Optional[s
     question_text = str(question.get("question", "")).lower()
     declared_format = str(question.get("format", "single")).lower()
     
-    warnings = []
-    
-    # Check for format-specific patterns
-    if declared_format == "match":
-        # Match questions should contain "match" or pairing indicators
-        if "match" not in question_text and "row" not in question_text:
-            warnings.append("Match format declared but question doesn't contain match/pairing indicators")
-    elif declared_format == "statement":
-        # Statement questions should contain "statement" or "consider the following"
-        if "statement" not in question_text and "consider the following" not in question_text:
-            warnings.append("Statement format declared but question doesn't contain statement indicators")
-    elif declared_format == "assertion":
-        # Assertion-Reason questions should contain assertion/reason indicators
-        assertion_keywords = ["assertion", "reason", "statement i", "statement ii", "assertion (a)", "reason (r)"]
-        if not any(keyword in question_text for keyword in assertion_keywords):
-            warnings.append("Assertion format declared but question doesn't contain assertion/reason indicators")
-    elif declared_format == "table":
-        # Table questions should contain table indicators
-        if "table" not in question_text and "row" not in question_text and "column" not in question_text:
-            warnings.append("Table format declared but question doesn't contain table indicators")
-    elif declared_format == "paragraph":
-        # Paragraph questions should be longer
+    # Paragraph questions should be longer
+    if declared_format == "paragraph":
         if len(question_text) < 100:
-            warnings.append("Paragraph format declared but question seems too short")
+            return False, "Paragraph format declared but question seems too short"
+        return True, None
     
-    if warnings:
-        return False, "; ".join(warnings)
+    # Check for format-specific patterns
+    rule = _FORMAT_KEYWORDS.get(declared_format)
+    if rule is not None:
+        keywords, warning = rule
+        if not _has_format_indicator(question_text, declared_format, keywords):
+            return False, warning
     
     return True, None
 
 
-def validate_question(question: Dict[str, Any], question_id: str, check_correct_answer: bool = False) -> Tuple[bool, List[str]]:
+def validate_question(
+    question: Dict[str, Any],
+    question_id: str,
+    check_correct_answer: bool = False,
+    fast_fail: bool = False
+) -> Tuple[bool, List[str]]:
     """
     Comprehensive validation of question data.
     
@@ -99,6 +208,7 @@ def validate_question(question: Dict[str, Any], question_id: str, check_correct_
         question: Question dictionary
         question_id: Question ID for logging
         check_correct_answer: If True, validate correct_answer is not null
+        fast_fail: If True, stop at the first error (the list then holds only that error)
     
     Returns:
         (is_valid, list_of_validation_errors)
@@ -108,6 +218,8 @@ def validate_question(question: Dict[str, Any], question_id: str, check_correct_
     # Required fields
     if not question.get("question") or not str(question.get("question", "")).strip():
         errors.append("Missing or empty question text")
+        if fast_fail:
+            return False, errors
     
     # Check options
     options = question.get("options", {})
@@ -118,12 +230,16 @@ def validate_question(question: Dict[str, Any], question_id: str, check_correct_
         missing_options = [opt for opt in required_options if not options.get(opt) or not str(options.get(opt, "")).strip()]
         if missing_options:
             errors.append(f"Missing or empty options: {', '.join(missing_options)}")
+    if errors and fast_fail:
+        return False, errors
     
     # Check correct_answer (only if explicitly requested)
     if check_correct_answer:
         correct_answer = question.get("correct_answer")
         if correct_answer is None or (isinstance(correct_answer, str) and not correct_answer.strip()):
             errors.append("Missing or null correct_answer")
+            if fast_fail:
+                return False, errors
         else:
             # Validate correct_answer format - should be option letter (A, B, C, D) or valid option text
             correct_answer_str = str(correct_answer).strip().upper()
@@ -142,6 +258,8 @@ def validate_question(question: Dict[str, Any], question_id: str, check_correct_
     valid_formats = ["single", "statement", "match", "table", "assertion", "paragraph"]
     if question_format and question_format not in valid_formats:
         errors.append(f"Invalid format: {question_format} (valid: {', '.join(valid_formats)})")
+        if fast_fail:
+            return False, errors
     
     # Check if extracted successfully
     if not question.get("extracted_successfully", True):
@@ -150,6 +268,17 @@ def validate_question(question: Dict[str, Any], question_id: str, check_correct_
     return len(errors) == 0, errors
 
 
+_LETTERS = frozenset(("A", "B", "C", "D"))
+
+
+def option_text_index(options: Dict[str, str]) -> Dict[str, str]:
+    """
+    Build a reverse map from option text (stripped, upper-cased) to option letter.
+    When two options share the same text, the first letter wins.
+    """
+    return {str(text).strip().upper(): letter for letter, text in reversed(options.items()) if text}
+
+
 def normalize_correct_answer(correct_answer: Any, options: Dict[str, str]) -> str:
     """
     Normalize correct_answer to option letter (A, B, C, D).
@@ -169,24 +298,32 @@ def normalize_correct_answer(correct_answer: Any, options: Dict[str, str]) -> st
         return ""
     
     correct_answer_str = str(correct_answer).strip()
+    correct_answer_upper = correct_answer_str.upper()
     
     # If it's already a valid option letter, return it
-    if correct_answer_str.upper() in ["A", "B", "C", "D"]:
-        return correct_answer_str.upper()
-    
-    # Try to match against option text (case-insensitive)
-    correct_answer_upper = correct_answer_str.upper()
-    for letter, option_text in options.items():
-        if option_text and correct_answer_upper == str(option_text).strip().upper():
-            return letter
+    if correct_answer_upper in _LETTERS:
+        return correct_answer_upper
     
+    # Try to match against option text (case-insensitive).
     # If no match found, return original (validation will catch if invalid)
-    return correct_answer_str
+    return option_text_index(options).get(correct_answer_upper, correct_answer_str)
+
+
+# CSV column order - id is first, json_question_id is second
+_CSV_COLS = (
+    "id", "json_question_id", "question_text", "option_a", "option_b", "option_c", "option_d",
+    "exam", "year", "question_format", "correct_option",
+    "subject", "topic", "sub_topic", "keywords"
+)
 
 
-def map_json_to_csv_row(question: Dict[str, Any], exam: Optional[str], year: Optional[int], row_id: int) -> Dict[str, Any]:
+def map_json_to_csv_row(question: Dict[str, Any], exam: Optional[str], year: Optional[int], row_id: int) -> List[str]:
     """
-    Map JSON question object to CSV row format.
+    Map JSON question object to CSV row values.
+    
+    Values are converted to strings and stripped of leading/trailing
+    whitespace. Internal newlines are preserved - the CSV writer with
+    QUOTE_MINIMAL quotes fields containing newlines, commas, or quotes.
     
     Args:
         question: JSON question object
@@ -195,7 +332,7 @@ def map_json_to_csv_row(question: Dict[str, Any], exam: Optional[str], year: Opt
         row_id: Auto-incrementing row ID
     
     Returns:
-        Dictionary with CSV column names as keys
+        List of cleaned string values in _CSV_COLS order
     """
     # Extract options
     options = question.get("options", {})
@@ -211,53 +348,333 @@ def map_json_to_csv_row(question: Dict[str, Any], exam: Optional[str], year: Opt
     else:
         keywords_str = str(keywords) if keywords else ""
     
-    # Map fields to CSV columns
-    row = {
-        "id": row_id,  # Auto-incrementing ID
-        "json_question_id": question.get("id", ""),  # Original JSON question ID for internal mapping
-        "question_text": question.get("question", ""),
-        "option_a": options.get("A", ""),
-        "option_b": options.get("B", ""),
-        "option_c": options.get("C", ""),
-        "option_d": options.get("D", ""),
-        "exam": exam or "",
-        "year": year if year is not None else "",
-        "question_format": question.get("format", "single"),
-        "correct_option": normalized_correct,  # Normalized to option letter
-        "subject": question.get("subject", "") or "",
-        "topic": question.get("topic", "") or "",
-        "sub_topic": question.get("sub_topic", "") or "",
-        "keywords": keywords_str
-    }
+    # Map fields to CSV columns (same order as _CSV_COLS)
+    values = (
+        row_id,  # Auto-incrementing ID
+        question.get("id", ""),  # Original JSON question ID for internal mapping
+        question.get("question", ""),
+        options.get("A", ""),
+        options.get("B", ""),
+        options.get("C", ""),
+        options.get("D", ""),
+        exam or "",
+        year,
+        question.get("format", "single"),
+        normalized_correct,  # Normalized to option letter
+        question.get("subject", "") or "",
+        question.get("topic", "") or "",
+        question.get("sub_topic", "") or "",
+        keywords_str
+    )
     
-    return row
+    return ["" if v is None else str(v).strip() for v in values]
 
 
-def clean_csv_value(value: Any) -> str:
+# A CSV row starts with its numeric id
+_ROW_START_RE = re.compile(rb'\d+,')
+
+
+def meta_path_for(output_path: Path) -> Path:
+    """Sidecar file that records the last written row ID (e.g. questions.meta.json)."""
+    return output_path.with_suffix(".meta.json")
+
+
+def _tail_last_id(output_path: Path, window: int = 1 << 16) -> Optional[int]:
     """
-    Clean and escape CSV value to handle quotes, newlines, and special characters.
-    
-    Note: Newlines are preserved - the CSV writer will automatically quote fields
-    containing newlines to ensure proper CSV format.
+    Read the ID of the last CSV row from the file's tail (IDs only ever grow).
     
-    Args:
-        value: Value to clean
+    Rows can span several lines (quoted newlines in question text), and a
+    quoted line such as "1, 2 and 3 only" also looks like a row start. So a
+    candidate is only trusted once a confirmed complete row precedes it:
+    line starts in the last `window` bytes are tried from the end until the
+    text from there parses as exactly two full-width rows with increasing
+    IDs (or as the header plus one row at the top of the file).
     
     Returns:
-        Cleaned string value (with newlines preserved)
+        The last row ID, or None if no confirmed row was found in the window
     """
-    if value is None:
-        return ""
+    with open(output_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return None
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            lo = max(0, size - window)
+            end = size
+            while True:
+                nl = mm.rfind(b'\n', lo, end)
+                if nl == -1:
+                    if lo > 0:
+                        return None
+                    start = 0   # top of file: only the header can confirm
+                else:
+                    start = nl + 1
+                
+                if start == 0 or _ROW_START_RE.match(mm, start):
+                    tail = mm[start:].decode('utf-8', errors='replace')
+                    rows = [r for r in csv.reader(io.StringIO(tail)) if r]
+                    if len(rows) == 2 and all(len(r) == len(_CSV_COLS) for r in rows):
+                        first, last = rows[0][0], rows[1][0]
+                        if last.isdigit() and (
+                            first.isdigit() and int(first) < int(last)
+                            or start == 0 and tuple(rows[0]) == _CSV_COLS
+                        ):
+                            return int(last)
+                
+                if nl == -1:
+                    return None
+                end = nl
+
+
+def read_last_id(output_path: Path, output_format: str = "csv") -> int:
+    """
+    Return the last row ID in an existing output file (0 if it has none).
     
-    # Convert to string
-    text = str(value)
+    Uses the sidecar written by the previous run when it still matches the
+    file's size, then (for CSV) the file's tail; only if both miss does it
+    scan the whole id column.
+    """
+    meta_path = meta_path_for(output_path)
+    if meta_path.exists():
+        try:
+            meta = load_json_file(meta_path)
+            if meta.get("output_size") == output_path.stat().st_size:
+                return int(meta["last_id"])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            pass  # stale or corrupt sidecar - fall back to scanning
+    
+    if output_format == "parquet":
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+        last_id = pc.max(pq.read_table(output_path, columns=["id"]).column("id")).as_py()
+        return last_id or 0
+    
+    last_id = _tail_last_id(output_path)
+    if last_id is not None:
+        return last_id
+    
+    with open(output_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        return max((int(row["id"]) for row in reader if (row.get("id") or "").isdigit()), default=0)
+
+
+def write_last_id(output_path: Path, last_id: int) -> None:
+    """Record the last row ID (and the output size it belongs to) in the sidecar."""
+    dump_json_file({
+        "last_id": last_id,
+        "output_size": output_path.stat().st_size
+    }, meta_path_for(output_path))
+
+
+class CsvRowWriter:
+    """
+    Writes CSV rows (lists of strings in _CSV_COLS order) to output_path.
+    """
     
-    # Preserve newlines - CSV writer with QUOTE_MINIMAL will automatically quote
-    # fields containing newlines, commas, or quotes to ensure proper CSV format
-    # Only strip leading/trailing whitespace (not internal newlines)
-    text = text.strip()
+    def __init__(self, output_path: Path, append: bool = False, pretty_format: bool = False):
+        # Write header only if not appending or file is new
+        write_mode = "a" if append and output_path.exists() else "w"
+        
+        self.pretty_format = pretty_format
+        self.file = open(output_path, write_mode, newline='', encoding='utf-8', buffering=1 << 20)
+        
+        if pretty_format:
+            # Pretty format: "\n" line endings plus a blank line after each row
+            self.writer = csv.writer(self.file, quoting=csv.QUOTE_MINIMAL, lineterminator="\n")
+            if write_mode == "w":
+                self.file.write(",".join(_CSV_COLS) + "\n")
+        else:
+            self.writer = csv.writer(self.file, quoting=csv.QUOTE_MINIMAL, escapechar='\\')
+            if write_mode == "w":
+                self.writer.writerow(_CSV_COLS)
+    
+    def write_rows(self, rows: List[List[str]]) -> None:
+        if self.pretty_format:
+            for row in rows:
+                self.writer.writerow(row)
+                self.file.write("\n")
+        else:
+            self.writer.writerows(rows)
     
-    return text
+    def close(self) -> None:
+        self.file.close()
+
+
+# Integer columns in Parquet output (empty string -> null); all others are strings
+_INT_COLS = frozenset(("id", "year"))
+
+
+class ParquetRowWriter:
+    """
+    Writes the same rows as CsvRowWriter to a zstd-compressed Parquet file,
+    one row group per write_rows() call. Low-cardinality columns (exam,
+    subject, topic, ...) get pyarrow's default dictionary encoding.
+    
+    Parquet files cannot be appended in place, so append mode streams the
+    existing row groups into a temp file first and swaps it in on close().
+    """
+    
+    def __init__(self, output_path: Path, append: bool = False):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        self.pa = pa
+        self.schema = pa.schema([
+            (col, pa.int32() if col in _INT_COLS else pa.string()) for col in _CSV_COLS
+        ])
+        self.output_path = output_path
+        self.tmp_path = output_path.with_name(output_path.name + ".tmp")
+        self.writer = pq.ParquetWriter(self.tmp_path, self.schema, compression="zstd")
+        
+        if append and output_path.exists():
+            for batch in pq.ParquetFile(output_path).iter_batches():
+                self.writer.write_batch(batch)
+    
+    def write_rows(self, rows: List[List[str]]) -> None:
+        if not rows:
+            return
+        
+        arrays = []
+        for field, values in zip(self.schema, zip(*rows)):
+            if field.name in _INT_COLS:
+                values = [int(v) if v else None for v in values]
+            arrays.append(self.pa.array(values, type=field.type))
+        
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+    
+    def close(self) -> None:
+        self.writer.close()
+        os.replace(self.tmp_path, self.output_path)
+
+
+def _process_one_file(json_file: Path, validate: bool, skip_null_answer: bool, timestamp: str) -> Dict[str, Any]:
+    """
+    Parse and validate one JSON file. Runs in a worker process, so it only
+    returns data; merge_json_files() does all printing and writing.
+    
+    Rejected records are stamped with the run's timestamp.
+    
+    Returns:
+        Dictionary with:
+            rows: CSV rows (id column is assigned later by the writer)
+            rejected: rejected question records
+            stats: per-file counters, or None if the file could not be processed
+            log: messages to print, in order
+            traceback: formatted traceback for unexpected errors, else None
+    """
+    log = [f"[INFO] Processing {json_file.name}..."]
+    result = {"rows": [], "rejected": [], "stats": None, "log": log, "traceback": None}
+    
+    try:
+        # Extract exam and year from filename
+        exam, year = parse_filename(json_file.name)
+        if not exam:
+            log.append(f"  [WARNING] Could not parse exam from filename: {json_file.name}")
+            return result
+        
+        log.append(f"  [INFO] Exam: {exam}, Year: {year if year else 'N/A'}")
+        
+        # Read JSON file
+        try:
+            data = load_json_file(json_file)
+        except json.JSONDecodeError as e:
+            log.append(f"  [ERROR] Failed to parse JSON: {e}")
+            return result
+        
+        # Validate structure
+        if validate:
+            if not isinstance(data, list):
+                log.append(f"  [WARNING] JSON file does not contain an array: {json_file.name}")
+                return result
+        
+        # Process each question
+        rows = []
+        rejected_questions = []
+        file_questions = 0
+        file_skipped = 0
+        file_rejected_null = 0
+        file_rejected_validation = 0
+        file_format_warnings = 0
+        
+        for question in data:
+            question_json_id = question.get("id", "unknown")
+            
+            # Skip if not extracted successfully
+            if not question.get("extracted_successfully", True):
+                file_skipped += 1
+                rejected_questions.append({
+                    "json_question_id": question_json_id,
+                    "reason": "extracted_successfully is False",
+                    "source_file": json_file.name,
+                    "timestamp": timestamp
+                })
+                continue
+            
+            # Check for null correct_answer first (before validation)
+            correct_answer = question.get("correct_answer")
+            has_null_answer = (correct_answer is None or (isinstance(correct_answer, str) and not correct_answer.strip()))
+            
+            if skip_null_answer and has_null_answer:
+                file_rejected_null += 1
+                rejected_questions.append({
+                    "json_question_id": question_json_id,
+                    "reason": "null_correct_answer",
+                    "source_file": json_file.name,
+                    "timestamp": timestamp
+                })
+                continue
+            
+            # Validate question (don't check correct_answer here since we handle it separately).
+            # Stop at the first error - rejected questions only need a reason.
+            is_valid, validation_errors = validate_question(
+                question, question_json_id, check_correct_answer=False, fast_fail=True
+            )
+            if not is_valid:
+                file_rejected_validation += 1
+                rejected_questions.append({
+                    "json_question_id": question_json_id,
+                    "reason": "validation_failed",
+                    "errors": validation_errors,
+                    "source_file": json_file.name,
+                    "timestamp": timestamp
+                })
+                continue
+            
+            # Validate format
+            format_valid, format_warning = validate_question_format(question)
+            if not format_valid:
+                file_format_warnings += 1
+                log.append(f"  [WARNING] Format validation for {question_json_id}: {format_warning}")
+            
+            # Map to CSV row (values already cleaned; id is a placeholder)
+            rows.append(map_json_to_csv_row(question, exam, year, 0))
+            file_questions += 1
+        
+        log.append(f"  [SUCCESS] Processed {file_questions} questions")
+        if file_skipped > 0:
+            log.append(f"  [SKIPPED] {file_skipped} questions (extraction failed)")
+        if file_rejected_null > 0:
+            log.append(f"  [REJECTED] {file_rejected_null} questions (null correct_answer)")
+        if file_rejected_validation > 0:
+            log.append(f"  [REJECTED] {file_rejected_validation} questions (validation failed)")
+        if file_format_warnings > 0:
+            log.append(f"  [WARNING] {file_format_warnings} questions (format mismatch)")
+        
+        result["rows"] = rows
+        result["rejected"] = rejected_questions
+        result["stats"] = {
+            "total_questions": file_questions,
+            "skipped": file_skipped,
+            "rejected_null_answer": file_rejected_null,
+            "rejected_validation": file_rejected_validation,
+            "format_warnings": file_format_warnings
+        }
+        
+    except Exception as e:
+        log.append(f"  [ERROR] Error processing {json_file.name}: {e}")
+        result["traceback"] = traceback.format_exc()
+    
+    return result
 
 
 def merge_json_files(
@@ -267,19 +684,26 @@ def merge_json_files(
     validate: bool = False,
     skip_null_answer: bool = True,
     log_rejected_path: Optional[Path] = None,
-    pretty_format: bool = False
+    pretty_format: bool = False,
+    workers: Optional[int] = None,
+    output_format: str = "csv",
+    rejects_format: str = "ndjson"
 ) -> Dict[str, int]:
     """
-    Merge all JSON files from input directory into a single CSV file.
+    Merge all JSON files from input directory into a single CSV (or Parquet) file.
     
     Args:
         input_dir: Directory containing JSON files
-        output_path: Path to output CSV file
+        output_path: Path to output CSV/Parquet file
         append: If True, append to existing CSV; otherwise overwrite
         validate: If True, validate JSON structure before processing
         skip_null_answer: If True, skip questions with null correct_answer
         log_rejected_path: Path to log file for rejected questions
         pretty_format: If True, add blank lines between rows (for readability)
+        workers: Worker processes for parsing/validating files (default: CPU count, 1 = in-process)
+        output_format: "csv" or "parquet" (requires pyarrow; pretty_format is ignored)
+        rejects_format: "ndjson" streams rejected records to <log>.ndjson next to a
+            summary-only log; "json" keeps everything in one JSON document
     
     Returns:
         Dictionary with statistics: total_questions, skipped, errors
@@ -295,7 +719,9 @@ def merge_json_files(
     }
     
     # Find all JSON files
-    json_files = list(input_dir.glob("*.json"))
+    # (scandir's DirEntry caches the file type, so no extra stat per entry)
+    with os.scandir(input_dir) as entries:
+        json_files = [Path(e.path) for e in entries if e.name.endswith(".json") and e.is_file()]
     
     if not json_files:
         print(f"[WARNING] No JSON files found in {input_dir}")
@@ -303,200 +729,120 @@ def merge_json_files(
     
     print(f"[INFO] Found {len(json_files)} JSON file(s) in {input_dir}")
     
-    # CSV column names - id is first, json_question_id is second
-    csv_columns = [
-        "id", "json_question_id", "question_text", "option_a", "option_b", "option_c", "option_d",
-        "exam", "year", "question_format", "correct_option",
-        "subject", "topic", "sub_topic", "keywords"
-    ]
-    
     # Determine starting ID
     start_id = 1
     if append and output_path.exists():
-        # Read existing CSV to get the last ID
+        # Read sidecar / existing CSV to get the last ID
         try:
-            with open(output_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-                if rows:
-                    last_id = max(int(row.get("id", 0)) for row in rows if row.get("id", "").isdigit())
-                    start_id = last_id + 1
+            start_id = read_last_id(output_path, output_format) + 1
         except Exception as e:
-            print(f"[WARNING] Could not read existing CSV to determine starting ID: {e}")
+            print(f"[WARNING] Could not read existing output to determine starting ID: {e}")
             start_id = 1
     
-    # Setup rejected questions log
+    # Setup rejected questions log (one timestamp for the whole run).
+    # ndjson: records stream to <log>.ndjson as each file finishes and <log>.json
+    # only holds the summary; json: one document with summary + all records.
     rejected_questions = []
+    total_rejected = 0
+    run_ts = datetime.now().isoformat()
     if log_rejected_path is None:
         log_rejected_path = output_path.parent / "rejected_questions.json"
     
-    # Determine write mode
-    write_mode = "a" if append and output_path.exists() else "w"
+    rejects_path = log_rejected_path.with_suffix(".ndjson")
+    rejects_file = None
+    if rejects_format == "ndjson":
+        try:
+            rejects_path.parent.mkdir(parents=True, exist_ok=True)
+            rejects_file = open(rejects_path, 'wb', buffering=1 << 20)
+        except Exception as e:
+            print(f"[WARNING] Failed to open rejected questions log: {e}")
     
     # Track row ID
     current_id = start_id
     
-    # Open CSV file for writing
-    with open(output_path, write_mode, newline='', encoding='utf-8') as csvfile:
-        # Use custom writer for pretty formatting if requested
-        if pretty_format:
-            # For pretty format, we'll write manually with blank lines
-            writer = None
+    # Parse + validate files in worker processes; rows come back in file order
+    # so IDs stay monotonic and only this process touches the output file.
+    process_file = partial(
+        _process_one_file,
+        validate=validate,
+        skip_null_answer=skip_null_answer,
+        timestamp=run_ts
+    )
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(json_files))
+    
+    # Open output file for writing
+    if output_format == "parquet":
+        out = ParquetRowWriter(output_path, append=append)
+    else:
+        out = CsvRowWriter(output_path, append=append, pretty_format=pretty_format)
+    
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        if pool:
+            chunksize = max(1, min(4, len(json_files) // workers))
+            results = pool.map(process_file, json_files, chunksize=chunksize)
         else:
-            writer = csv.DictWriter(csvfile, fieldnames=csv_columns, quoting=csv.QUOTE_MINIMAL, escapechar='\\')
-        
-        # Write header only if not appending or file is new
-        if write_mode == "w" or not output_path.exists():
-            if pretty_format:
-                csvfile.write(",".join(csv_columns) + "\n")
-            else:
-                writer.writeheader()
+            results = map(process_file, json_files)
         
-        # Process each JSON file
-        for json_file in json_files:
-            print(f"[INFO] Processing {json_file.name}...")
+        for result in results:
+            for line in result["log"]:
+                print(line)
+            if result["traceback"]:
+                sys.stderr.write(result["traceback"])
             
-            try:
-                # Extract exam and year from filename
-                exam, year = parse_filename(json_file.name)
-                if not exam:
-                    print(f"  [WARNING] Could not parse exam from filename: {json_file.name}")
-                    stats["errors"] += 1
-                    continue
-                
-                print(f"  [INFO] Exam: {exam}, Year: {year if year else 'N/A'}")
-                
-                # Read JSON file
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    try:
-                        data = json.load(f)
-                    except json.JSONDecodeError as e:
-                        print(f"  [ERROR] Failed to parse JSON: {e}")
-                        stats["errors"] += 1
-                        continue
-                
-                # Validate structure
-                if validate:
-                    if not isinstance(data, list):
-                        print(f"  [WARNING] JSON file does not contain an array: {json_file.name}")
-                        stats["errors"] += 1
-                        continue
-                
-                # Process each question
-                file_questions = 0
-                file_skipped = 0
-                file_rejected_null = 0
-                file_rejected_validation = 0
-                file_format_warnings = 0
-                
-                for question in data:
-                    question_json_id = question.get("id", "unknown")
-                    
-                    # Skip if not extracted successfully
-                    if not question.get("extracted_successfully", True):
-                        file_skipped += 1
-                        rejected_questions.append({
-                            "json_question_id": question_json_id,
-                            "reason": "extracted_successfully is False",
-                            "source_file": json_file.name,
-                            "timestamp": datetime.now().isoformat()
-                        })
-                        continue
-                    
-                    # Check for null correct_answer first (before validation)
-                    correct_answer = question.get("correct_answer")
-                    has_null_answer = (correct_answer is None or (isinstance(correct_answer, str) and not correct_answer.strip()))
-                    
-                    if skip_null_answer and has_null_answer:
-                        file_rejected_null += 1
-                        rejected_questions.append({
-                            "json_question_id": question_json_id,
-                            "reason": "null_correct_answer",
-                            "source_file": json_file.name,
-                            "timestamp": datetime.now().isoformat()
-                        })
-                        continue
-                    
-                    # Validate question (don't check correct_answer here since we handle it separately)
-                    is_valid, validation_errors = validate_question(question, question_json_id, check_correct_answer=False)
-                    if not is_valid:
-                        file_rejected_validation += 1
-                        rejected_questions.append({
-                            "json_question_id": question_json_id,
-                            "reason": "validation_failed",
-                            "errors": validation_errors,
-                            "source_file": json_file.name,
-                            "timestamp": datetime.now().isoformat()
-                        })
-                        continue
-                    
-                    # Validate format
-                    format_valid, format_warning = validate_question_format(question)
-                    if not format_valid:
-                        file_format_warnings += 1
-                        print(f"  [WARNING] Format validation for {question_json_id}: {format_warning}")
-                    
-                    # Map to CSV row
-                    row = map_json_to_csv_row(question, exam, year, current_id)
-                    current_id += 1
-                    
-                    # Clean values
-                    cleaned_row = {k: clean_csv_value(v) for k, v in row.items()}
-                    
-                    # Write row
-                    if pretty_format:
-                        # Write with manual formatting (blank line after each row)
-                        # Use csv.writer for proper escaping, but add blank line after
-                        row_values = [str(cleaned_row.get(col, "")) for col in csv_columns]
-                        # Create a temporary StringIO to use csv.writer for proper escaping
-                        temp_buffer = io.StringIO()
-                        temp_writer = csv.writer(temp_buffer, quoting=csv.QUOTE_MINIMAL)
-                        temp_writer.writerow(row_values)
-                        csv_line = temp_buffer.getvalue().rstrip('\r\n')
-                        csvfile.write(csv_line + "\n\n")
-                    else:
-                        writer.writerow(cleaned_row)
-                    
-                    file_questions += 1
-                
-                stats["total_questions"] += file_questions
-                stats["skipped"] += file_skipped
-                stats["rejected_null_answer"] += file_rejected_null
-                stats["rejected_validation"] += file_rejected_validation
-                stats["format_warnings"] += file_format_warnings
-                stats["files_processed"] += 1
-                
-                print(f"  [SUCCESS] Processed {file_questions} questions")
-                if file_skipped > 0:
-                    print(f"  [SKIPPED] {file_skipped} questions (extraction failed)")
-                if file_rejected_null > 0:
-                    print(f"  [REJECTED] {file_rejected_null} questions (null correct_answer)")
-                if file_rejected_validation > 0:
-                    print(f"  [REJECTED] {file_rejected_validation} questions (validation failed)")
-                if file_format_warnings > 0:
-                    print(f"  [WARNING] {file_format_warnings} questions (format mismatch)")
-                
-            except Exception as e:
-                print(f"  [ERROR] Error processing {json_file.name}: {e}")
-                import traceback
-                traceback.print_exc()
+            file_stats = result["stats"]
+            if file_stats is None:
                 stats["errors"] += 1
                 continue
+            
+            rejected = result["rejected"]
+            total_rejected += len(rejected)
+            if rejects_file:
+                rejects_file.writelines(dumps_json_line(rec) for rec in rejected)
+            elif rejects_format == "json":
+                rejected_questions.extend(rejected)
+            
+            rows = result["rows"]
+            for row in rows:
+                row[0] = str(current_id)
+                current_id += 1
+            out.write_rows(rows)
+            
+            for key, value in file_stats.items():
+                stats[key] += value
+            stats["files_processed"] += 1
+    finally:
+        if pool:
+            pool.shutdown()
+        out.close()
+        if rejects_file:
+            rejects_file.close()
+    
+    # Remember the last ID so the next --append run doesn't rescan the output
+    try:
+        write_last_id(output_path, current_id - 1)
+    except Exception as e:
+        print(f"[WARNING] Failed to write ID sidecar: {e}")
     
     # Write rejected questions log (always write, even if empty, to clear old data)
     try:
         log_rejected_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(log_rejected_path, 'w', encoding='utf-8') as f:
-            json.dump({
-                "summary": {
-                    "total_rejected": len(rejected_questions),
-                    "rejected_null_answer": stats["rejected_null_answer"],
-                    "rejected_validation": stats["rejected_validation"],
-                    "rejected_extraction_failed": stats["skipped"]
-                },
-                "rejected_questions": rejected_questions
-            }, f, indent=2, ensure_ascii=False)
-        if rejected_questions:
+        log_data = {
+            "summary": {
+                "total_rejected": total_rejected,
+                "rejected_null_answer": stats["rejected_null_answer"],
+                "rejected_validation": stats["rejected_validation"],
+                "rejected_extraction_failed": stats["skipped"]
+            }
+        }
+        if rejects_format == "json":
+            log_data["rejected_questions"] = rejected_questions
+        else:
+            log_data["rejected_questions_file"] = rejects_path.name
+        dump_json_file(log_data, log_rejected_path)
+        if total_rejected:
             print(f"[INFO] Rejected questions logged to: {log_rejected_path}")
         else:
             print(f"[INFO] Rejected questions log cleared (no rejections): {log_rejected_path}")
@@ -512,7 +858,7 @@ def merge_json_files(
     print(f"  Format warnings: {stats['format_warnings']}")
     print(f"  Errors: {stats['errors']}")
     print(f"  Output saved to: {output_path}")
-    if rejected_questions:
+    if total_rejected:
         print(f"  Rejected questions log: {log_rejected_path}")
     
     return stats
@@ -567,6 +913,26 @@ def main():
         action="store_true",
         help="Add blank lines between rows for better readability (testing/debugging only)"
     )
+    parser.add_argument(
+        "--format",
+        dest="output_format",
+        choices=["csv", "parquet"],
+        default="csv",
+        help="Output file format (default: csv). parquet requires pyarrow"
+    )
+    parser.add_argument(
+        "--rejects-format",
+        choices=["ndjson", "json"],
+        default="ndjson",
+        help="Rejected questions log format: ndjson streams records to <log>.ndjson "
+             "with a summary in <log>.json; json writes one document (default: ndjson)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for parsing/validating JSON files (default: CPU count; 1 disables multiprocessing)"
+    )
     parser.add_argument(
         "--update-exam-sets",
         action="store_true",
@@ -585,6 +951,17 @@ def main():
     else:
         output_path = (script_dir / args.output).resolve()
     
+    if args.output_format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("[ERROR] --format parquet requires pyarrow (pip install pyarrow)")
+            sys.exit(1)
+        
+        # Don't write Parquet into a .csv-named file (e.g. the default --output)
+        if output_path.suffix == ".csv":
+            output_path = output_path.with_suffix(".parquet")
+    
     # Resolve log path relative to script directory if it's a relative path
     if args.log_rejected:
         if Path(args.log_rejected).is_absolute():
@@ -610,7 +987,10 @@ def main():
         validate=args.validate,
         skip_null_answer=args.skip_null_answer,
         log_rejected_path=log_rejected_path,
-        pretty_format=args.pretty_format
+        pretty_format=args.pretty_format,
+        workers=args.workers,
+        output_format=args.output_format,
+        rejects_format=args.rejects_format
     )
     
     if stats["errors"] > 0:
@@ -664,7 +1044,10 @@ def update_exam_sets_from_csv(csv_path: Path):
             return
         
         print(f"[INFO] Loading CSV from: {csv_path}")
-        df = pd.read_csv(csv_path, keep_default_na=False)
+        if csv_path.suffix == ".parquet":
+            df = pd.read_parquet(csv_path)
+        else:
+            df = pd.read_csv(csv_path, keep_default_na=False)
         df = df.replace('', pd.NA)
         
         if len(df) == 0:
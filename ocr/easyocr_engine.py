@@ -1,12 +1,79 @@
 # ocr/easyocr_engine.py
 
+import threading
 import easyocr
+import numpy as np
+from PIL import Image
+
+# One EasyOCR reader per (langs, gpu) per process
+_READERS = {}
+_READER_LOCK = threading.Lock()
+
+
+def get_reader(langs=("en",), gpu=False):
+    """
+    Returns the process-wide EasyOCR reader for this config,
+    loading the model weights only on first use.
+    """
+    key = (tuple(langs), gpu)
+
+    reader = _READERS.get(key)
+    if reader is not None:
+        return reader
+
+    with _READER_LOCK:
+        reader = _READERS.get(key)
+        if reader is None:
+            print("[OCR] Initializing EasyOCR")
+            reader = easyocr.Reader(list(langs), gpu=gpu)
+            _READERS[key] = reader
+
+    return reader
+
+
+def _image_size(image):
+    """(width, height) of an image path (header only) or array."""
+    if isinstance(image, np.ndarray):
+        return image.shape[1], image.shape[0]
+    with Image.open(image) as im:
+        return im.size
+
 
 class OCREngine:
     def __init__(self):
-        print("[OCR] Initializing EasyOCR")
-        self.reader = easyocr.Reader(['en'], gpu=False)
+        self.reader = get_reader()
 
     def extract_text(self, image_path):
         result = self.reader.readtext(image_path, detail=0)
         return "\n".join(result)
+
+    def extract_text_batch(self, images, batch_size=8):
+        """
+        OCR several images (paths or BGR arrays) with readtext_batched,
+        so detection runs once per batch instead of once per image.
+
+        readtext_batched needs equal-sized inputs: images are grouped
+        by size first (only a path's header is read here).
+
+        Returns one text per input image (same order).
+        """
+        groups = {}
+        for i, image in enumerate(images):
+            groups.setdefault(_image_size(image), []).append(i)
+
+        texts = [""] * len(images)
+
+        for idxs in groups.values():
+            for start in range(0, len(idxs), batch_size):
+                chunk = idxs[start:start + batch_size]
+
+                results = self.reader.readtext_batched(
+                    [images[i] for i in chunk],
+                    batch_size=len(chunk),
+                    detail=0
+                )
+
+                for i, result in zip(chunk, results):
+                    texts[i] = "\n".join(result)
+
+        return texts
@@ -1,24 +1,73 @@
 ﻿# ocr/paddle_ocr_engine.py
 
+import cv2
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from paddleocr import PaddleOCR
 from ocr.post_cleaner import clean_ocr_block
 
+# One PaddleOCR model per (lang, use_angle_cls) per process
+_OCR_INSTANCES = {}
+_OCR_LOCK = threading.Lock()
+
+
+def get_ocr(lang="en", use_angle_cls=False):
+    """
+    Returns the process-wide PaddleOCR instance for this config,
+    loading the model weights only on first use.
+    """
+    key = (lang, use_angle_cls)
+
+    ocr = _OCR_INSTANCES.get(key)
+    if ocr is not None:
+        return ocr
+
+    with _OCR_LOCK:
+        ocr = _OCR_INSTANCES.get(key)
+        if ocr is None:
+            print("[OCR] Initializing PaddleOCR...")
+            ocr = PaddleOCR(lang=lang, use_angle_cls=use_angle_cls)
+            _OCR_INSTANCES[key] = ocr
+
+    return ocr
+
+
+def load_images(image_paths):
+    """
+    Reads images from disk in parallel (I/O bound).
+    Unreadable paths come back as None.
+    """
+    with ThreadPoolExecutor() as pool:
+        return list(pool.map(cv2.imread, image_paths))
+
+
 class OCREngine:
-    def __init__(self):
-        print("[OCR] Initializing PaddleOCR...")
-        self.ocr = PaddleOCR(lang="en")
+    def __init__(self, lang="en", use_angle_cls=False):
+        self.ocr = get_ocr(lang, use_angle_cls)
 
-    def extract_text(self, image_path):
-        result = self.ocr.ocr(image_path)
-        lines = []
+    def extract_texts(self, image_paths):
+        """
+        OCR several images (loaded from disk in parallel).
+        PaddleOCR 2.x exits when det=True is given a list, so each
+        image gets its own ocr() call on the shared model.
+
+        Returns one cleaned text per input path (same order).
+        """
+        texts = []
 
-        if not result or not result[0]:
-            return ""
+        for img in load_images(image_paths):
+            result = self.ocr.ocr(img) if img is not None else None
 
-        for box, (text, conf) in result[0]:
-            lines.append(text)
+            if not result or not result[0]:
+                texts.append("")
+                continue
 
-        raw_text = "\n".join(lines)
+            raw_text = "\n".join(text for box, (text, conf) in result[0])
 
-        # USE STRONG CLEANER
-        return clean_ocr_block(raw_text)
+            # USE STRONG CLEANER
+            texts.append(clean_ocr_block(raw_text))
+
+        return texts
+
+    def extract_text(self, image_path):
+        return self.extract_texts([image_path])[0]
@@ -5,13 +5,33 @@
 # - Parses ONE question block using Groq LLM
 # - Dynamically injects exam syllabus into system prompt
 # - Enforces syllabus-bounded subject/topic tagging
+# - Async variant for concurrent per-block fanout
 # ------------------------------------------------------
 
+import asyncio
 import os
+import sqlite3
+import threading
+import weakref
+from functools import lru_cache
+
+import httpx
 from groq import Groq
 from dotenv import load_dotenv
 
 from utils.syllabus_loader import load_syllabus
+from phase2.json_sanitizer import sanitize_and_load
+
+try:
+    from blake3 import blake3 as _hasher
+except ImportError:  # stdlib fallback
+    from hashlib import blake2b as _hasher
+
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json
+    orjson = None
+    import json
 
 # ------------------------------------------------------
 # ENV + CLIENT
@@ -24,6 +44,64 @@ if not API_KEY:
 
 client = Groq(api_key=API_KEY)
 
+# HTTP/2 multiplexes concurrent block requests over one TLS
+# connection; httpx needs the optional h2 package for it.
+try:
+    import h2  # noqa: F401
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+HTTP_LIMITS = httpx.Limits(max_connections=256, max_keepalive_connections=256)
+HTTP_TIMEOUT = httpx.Timeout(60.0)
+
+# The async path POSTs pre-encoded request bodies straight to the
+# OpenAI-compatible endpoint (no SDK model validation / re-encode).
+API_BASE = os.getenv("GROQ_BASE_URL", "https://api.groq.com")
+CHAT_URL = f"{API_BASE}/openai/v1/chat/completions"
+
+# Same retry policy as the Groq SDK: 2 retries with backoff
+MAX_RETRIES = 2
+_RETRY_STATUSES = (408, 409, 429, 500, 502, 503, 504)
+
+# httpx async connections belong to the event loop that opened them,
+# so each loop (one per asyncio.run) gets its own pool.
+_ASYNC_CLIENTS = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+
+    http_client = _ASYNC_CLIENTS.get(loop)
+    if http_client is None:
+        http_client = httpx.AsyncClient(
+            http2=HTTP2,
+            limits=HTTP_LIMITS,
+            timeout=HTTP_TIMEOUT,
+            headers={
+                "Authorization": f"Bearer {API_KEY}",
+                "Content-Type": "application/json",
+            },
+        )
+        _ASYNC_CLIENTS[loop] = http_client
+
+    return http_client
+
+
+def _retry_delay(retry_after, attempt: int) -> float:
+    try:
+        return min(float(retry_after), 60.0)
+    except (TypeError, ValueError):
+        return 0.5 * 2 ** attempt
+
+
+async def close_async_client():
+    """Close this loop's connection pool; call before the loop ends."""
+    http_client = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if http_client is not None:
+        await http_client.aclose()
+
+
 MODEL = "llama-3.3-70b-versatile"
 
 # ------------------------------------------------------
@@ -61,23 +139,18 @@ def _extract_exam_from_tag(tag: str) -> str:
 
 
 
-# ------------------------------------------------------
-# MAIN ENTRY
-# ------------------------------------------------------
+@lru_cache(maxsize=256)
+def _exam_from_tag(tag: str) -> str:
+    return _extract_exam_from_tag(tag)
 
-def parse_block(block_text: str, tag: str) -> str:
-    """
-    Sends ONE question block to Groq LLM with
-    dynamically injected syllabus.
 
-    Returns:
-        Raw LLM response (string)
+@lru_cache(maxsize=32)
+def _system_prompt_for(exam: str) -> str:
+    """
+    Builds the system prompt for an exam with its syllabus
+    injected. Cached: one syllabus read + replace per exam,
+    and an identical prompt prefix for every block.
     """
-
-    # -------------------------------
-    # DETERMINE EXAM
-    # -------------------------------
-    exam = _extract_exam_from_tag(tag)
 
     # -------------------------------
     # LOAD SYLLABUS
@@ -93,22 +166,281 @@ def parse_block(block_text: str, tag: str) -> str:
     # -------------------------------
     # INJECT SYLLABUS INTO PROMPT
     # -------------------------------
-    system_prompt = PARSE_BLOCK_SYSTEM_PROMPT.replace(
+    return PARSE_BLOCK_SYSTEM_PROMPT.replace(
         "{{SYLLABUS}}",
         syllabus_text
     )
 
-    # -------------------------------
-    # CALL GROQ LLM
-    # -------------------------------
-    response = client.chat.completions.create(
+
+def _system_prompt_for_tag(tag: str) -> str:
+    return _system_prompt_for(_exam_from_tag(tag))
+
+
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@lru_cache(maxsize=32)
+def _body_prefix(exam: str) -> bytes:
+    """
+    Request body up to and including the system message,
+    encoded once per exam and shared by every block.
+    """
+    return (
+        b'{"model":' + _dumps(MODEL)
+        + b',"temperature":0,"max_tokens":2048,"stream":true,"messages":['
+        + _dumps({"role": "system", "content": _system_prompt_for(exam)})
+        + b","
+    )
+
+
+def _request_body(block_text: str, tag: str) -> bytes:
+    """Same request as _request_kwargs (streamed), as ready-to-send JSON bytes."""
+    return (
+        _body_prefix(_exam_from_tag(tag))
+        + _dumps({"role": "user", "content": block_text})
+        + b"]}"
+    )
+
+
+def _request_kwargs(block_text: str, tag: str) -> dict:
+    return dict(
         model=MODEL,
         messages=[
-            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": _system_prompt_for_tag(tag)},
             {"role": "user", "content": block_text}
         ],
         temperature=0,
         max_tokens=2048
     )
 
-    return response.choices[0].message.content
+
+# ------------------------------------------------------
+# RESPONSE CACHE
+# ------------------------------------------------------
+# Keyed on (model, system prompt, block text). GROQ_CACHE=0 skips
+# lookups so every block is re-queried (fresh answers still stored).
+
+CACHE_ENABLED = os.getenv("GROQ_CACHE", "1") != "0"
+CACHE_PATH = "cache/groq_blocks.sqlite"
+
+_cache_db = None
+# async writes run on worker threads; one statement at a time per connection
+_CACHE_LOCK = threading.Lock()
+
+
+def _cache():
+    global _cache_db
+    if _cache_db is None:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        # autocommit; WAL lets pool workers read while another writes
+        _cache_db = sqlite3.connect(
+            CACHE_PATH, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        _cache_db.execute("PRAGMA journal_mode=WAL")
+        _cache_db.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, content TEXT NOT NULL)"
+        )
+    return _cache_db
+
+
+def _drop_cache_connection():
+    # a forked worker must not share the parent's SQLite handle, nor
+    # inherit _CACHE_LOCK held by one of the parent's threads
+    global _cache_db, _CACHE_LOCK
+    _cache_db = None
+    _CACHE_LOCK = threading.Lock()
+
+
+# POSIX only; spawned workers (Windows / macOS) start without a handle
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_drop_cache_connection)
+
+
+@lru_cache(maxsize=32)
+def _prompt_digest(system_prompt: str) -> str:
+    return _hasher(system_prompt.encode("utf-8")).hexdigest()
+
+
+def cache_key(block_text: str, tag: str) -> str:
+    prompt_digest = _prompt_digest(_system_prompt_for_tag(tag))
+    return _hasher(f"{MODEL}|{prompt_digest}|{block_text}".encode("utf-8")).hexdigest()
+
+
+def cache_get(key: str):
+    if not CACHE_ENABLED:
+        return None
+    with _CACHE_LOCK:
+        row = _cache().execute("SELECT content FROM responses WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def cache_put(key: str, content):
+    # only answers that parse to a question dict: an empty, truncated or
+    # garbled response must be re-queried next run, not replayed forever
+    if not isinstance(sanitize_and_load(content), dict):
+        return
+    with _CACHE_LOCK:
+        _cache().execute("INSERT OR REPLACE INTO responses VALUES (?, ?)", (key, content))
+
+
+# ------------------------------------------------------
+# MAIN ENTRY
+# ------------------------------------------------------
+
+class _JsonCloseScanner:
+    """
+    Tracks bracket depth of the JSON answer across streamed chunks
+    (brackets inside strings ignored). The answer is an object, so
+    tracking starts at the first "{": brackets in any prose before
+    it (e.g. "Here is [the] answer:") do not end the stream.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escape = False
+
+    def feed(self, chunk: str) -> int:
+        """Index in chunk where the value closes, or -1."""
+        for i, ch in enumerate(chunk):
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = self.started
+            elif ch == "{" or ch == "[" and self.started:
+                self.depth += 1
+                self.started = True
+            elif ch in "}]" and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    return i
+        return -1
+
+
+async def _read_stream(response) -> str:
+    """
+    Collect streamed delta tokens, stopping as soon as the JSON
+    answer closes: any trailing prose is never waited for.
+    """
+    parts = []
+    scanner = _JsonCloseScanner()
+
+    async for line in response.aiter_lines():
+        if not line.startswith("data:"):
+            continue
+
+        data = line[5:].strip()
+        if data == "[DONE]":
+            break
+
+        choices = _loads(data).get("choices")
+        delta = choices[0].get("delta", {}).get("content") if choices else None
+        if not delta:
+            continue
+
+        end = scanner.feed(delta)
+        if end != -1:
+            parts.append(delta[:end + 1])
+            break
+        parts.append(delta)
+
+    return "".join(parts)
+
+
+def _read_chunks(stream) -> str:
+    """
+    Sync _read_stream over the SDK's streamed chunks; the caller
+    closes the stream, dropping whatever the model still sends.
+    """
+    parts = []
+    scanner = _JsonCloseScanner()
+
+    for chunk in stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if not delta:
+            continue
+
+        end = scanner.feed(delta)
+        if end != -1:
+            parts.append(delta[:end + 1])
+            break
+        parts.append(delta)
+
+    return "".join(parts)
+
+
+def parse_block(block_text: str, tag: str) -> str:
+    """
+    Sends ONE question block to Groq LLM with
+    dynamically injected syllabus.
+
+    Returns:
+        Raw LLM response (string)
+    """
+    key = cache_key(block_text, tag)
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+
+    with client.chat.completions.create(**_request_kwargs(block_text, tag), stream=True) as stream:
+        content = _read_chunks(stream)
+
+    cache_put(key, content)
+    return content
+
+
+async def parse_block_async(block_text: str, tag: str) -> str:
+    """
+    Async parse_block: streams the Groq response so many blocks
+    can be in flight at once, returning as soon as the JSON closes.
+
+    Returns:
+        Raw LLM response (string)
+    """
+    key = cache_key(block_text, tag)
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+
+    http_client = get_async_client()
+    request = http_client.build_request("POST", CHAT_URL, content=_request_body(block_text, tag))
+
+    for attempt in range(MAX_RETRIES + 1):
+        retry_after = None
+        try:
+            response = await http_client.send(request, stream=True)
+        except httpx.TransportError:
+            if attempt == MAX_RETRIES:
+                raise
+        else:
+            if response.status_code not in _RETRY_STATUSES or attempt == MAX_RETRIES:
+                break
+            retry_after = response.headers.get("retry-after")
+            await response.aclose()
+
+        await asyncio.sleep(_retry_delay(retry_after, attempt))
+
+    try:
+        response.raise_for_status()
+        content = await _read_stream(response)
+    finally:
+        await response.aclose()
+
+    # a write can wait up to 30 s on another worker's lock: keep it off the loop
+    await asyncio.to_thread(cache_put, key, content)
+    return content
@@ -3,35 +3,155 @@
 # UPSC DATASET BUILDER — PHASE A (JSON ENRICHMENT)
 # -------------------------------------------------------------
 
+import asyncio
 import json
+import multiprocessing
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import cache, partial
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json
+    orjson = None
 
 from utils.upsc_text_reconstructor import reconstruct_text
 from phase2.segmenter_groq import segment_column
-from phase2.block_parser import parse_block
+from phase2.block_parser import parse_block_async, close_async_client, cache_key, cache_get, cache_put
+from phase2 import groq_batch
 from phase2.json_sanitizer import sanitize_and_load
-from phase2.option_normalizer import normalize_options
+from phase2.option_normalizer import OptionNormalizer
 from phase2.format_classifier import FormatClassifier
 from phase2.table_formatter import TableFormatter
 from phase2.match_formatter import MatchFormatter
 from phase2.ocr_fixer import SafeOCRFixer
 from phase2.id_gen import make_id
 
-format_classifier = FormatClassifier()
-table_formatter = TableFormatter()
-match_formatter = MatchFormatter()
-ocr_fixer = SafeOCRFixer()
+# Postprocessing singletons: built once per process on first use
+@cache
+def _classifier():
+    return FormatClassifier()
+
+
+@cache
+def _table_formatter():
+    return TableFormatter()
+
+
+@cache
+def _match_formatter():
+    return MatchFormatter()
+
+
+@cache
+def _ocr_fixer():
+    return SafeOCRFixer()
+
+
+@cache
+def _option_normalizer():
+    return OptionNormalizer()
+
+
+def _init_worker():
+    # Build every singleton once at worker start (not once per file)
+    _classifier()
+    _table_formatter()
+    _match_formatter()
+    _ocr_fixer()
+    _option_normalizer()
+
+# Max Groq block requests in flight at once (rate-limit guard)
+GROQ_NUM_PARALLEL = int(os.getenv("GROQ_NUM_PARALLEL", "8"))
+
+# GROQ_BATCH_MODE=1 → parse blocks through the Batch API (offline, half price)
+GROQ_BATCH_MODE = os.getenv("GROQ_BATCH_MODE") == "1"
 
 
 # -----------------------------------------------------
 # HELPERS
 # -----------------------------------------------------
 
-def _apply_statement_linebreaks(text: str) -> str:
+# _apply_statement_linebreaks patterns (steps 0-6)
+_RE_STMT_HARD = re.compile(r"Statement\s+([IVX]+)\s*[\.\s]*n\s+", re.IGNORECASE)
+_RE_BROKEN_IN = re.compile(r"(?:(?<=\n)|^)\s*(?:I|l|1)[\.\s]*n\s+([A-Z])")
+_RE_CONSIDER_ANY = re.compile(
+    r"(consider the following statements?|consider the following)",
+    re.IGNORECASE
+)
+_RE_ROMAN_BULLET = re.compile(r"(?<!Statement )(?<!\n)\b(I|II|III|IV|V|VI|VII|VIII|IX|X)\.")
+_RE_NUM_BULLET = re.compile(r"(?<!\n)(\b\d{1,2}\.)")
+_RE_MULTI_NL = re.compile(r"\n{2,}")
+
+# re.IGNORECASE also matches these against ASCII i / s
+_CASE_FOLD = str.maketrans({"İ": "i", "ı": "i", "ſ": "s"})
+
+
+_STMT_ROMANS = frozenset(("i", "ii", "iii", "iv", "v", "vi", "vii", "viii", "ix", "x"))
+
+
+def _fold_lower(text: str) -> str:
+    """Index-aligned lowercase copy (İ is the only char lower() widens)."""
+    return (text if text.isascii() else text.translate(_CASE_FOLD)).lower()
+
+
+def _normalize_statements(text: str, low: str = None) -> str:
+    """
+    Step 3 as a str.find scan. Same result as
+        re.sub(r"Statement\s*\n*\s*(I|II|III|IV|V|VI|VII|VIII|IX|X)\b(?!\.)",
+               r"\nStatement \1.", text, flags=re.IGNORECASE)
+    low: _fold_lower(text), if the caller already has it.
+    """
+    if low is None:
+        low = _fold_lower(text)
+
+    j = low.find("statement")
+    if j < 0:
+        return text
+
+    out = []
+    start = 0
+    n = len(text)
+
+    while j >= 0:
+        # roman starts after any whitespace and must be a whole word
+        k = j + 9
+        while k < n and text[k].isspace():
+            k += 1
+        e = k
+        while e < n and (text[e].isalnum() or text[e] == "_"):
+            e += 1
+
+        if e - k <= 4 and low[k:e] in _STMT_ROMANS and not text.startswith(".", e):
+            out.append(text[start:j])
+            out.append(f"\nStatement {text[k:e]}.")
+            start = e
+            j = low.find("statement", e)
+        else:
+            j = low.find("statement", j + 1)
+
+    out.append(text[start:])
+    return "".join(out)
+
+
+def _apply_statement_linebreaks(text: str, cleanup: bool = True) -> str:
+    """
+    cleanup=False skips the final blank-line collapse + strip, for
+    callers that pass the result straight to _apply_linebreaks
+    (which collapses newline runs and strips anyway).
+    """
     if not text:
         return text
 
+    # Each step rewrites the output of the one before, so the passes
+    # stay in order; cheap substring checks skip the ones that cannot
+    # match (most questions have no Statement header at all).
+    original = text
+    low = _fold_lower(text)
+    has_statement = "statement" in low
+
     # -------------------------------------------------
     # 0. HARD FIX: Split merged "Statement II.n India"
     # -------------------------------------------------
@@ -45,233 +165,529 @@ def _apply_statement_linebreaks(text: str) -> str:
     #   Statement II.
     #   In India
     # -------------------------------------------------
-    text = re.sub(
-        r"Statement\s+([IVX]+)\s*[\.\s]*n\s+",
-        r"\nStatement \1.\nIn ",
-        text,
-        flags=re.IGNORECASE
-    )
+    if has_statement:
+        text = _RE_STMT_HARD.sub(r"\nStatement \1.\nIn ", text)
 
     # -------------------------------------------------
     # 1. Generic OCR fix: broken "In" at line start
     # -------------------------------------------------
-    text = re.sub(
-        r"(?:(?<=\n)|^)\s*(?:I|l|1)[\.\s]*n\s+([A-Z])",
-        r"In \1",
-        text
-    )
+    text = _RE_BROKEN_IN.sub(r"In \1", text)
 
     # -------------------------------------------------
     # 2. Newline after "Consider the following"
     # -------------------------------------------------
-    text = re.sub(
-        r"(consider the following statements?|consider the following)",
-        r"\1\n",
-        text,
-        flags=re.IGNORECASE
-    )
+    if "consider the following" in low:
+        text = _RE_CONSIDER_ANY.sub(r"\1\n", text)
 
     # -------------------------------------------------
     # 3. Normalize remaining Statement headers
     # -------------------------------------------------
-    def normalize_statement(match):
-        roman = match.group(1)
-        return f"\nStatement {roman}."
-
-    text = re.sub(
-        r"Statement\s*\n*\s*(I|II|III|IV|V|VI|VII|VIII|IX|X)\b(?!\.)",
-        normalize_statement,
-        text,
-        flags=re.IGNORECASE
-    )
+    if has_statement:
+        # steps 0-2 usually change nothing (re.sub then returns the
+        # same object), so the lowercase copy from above still lines up
+        text = _normalize_statements(text, low if text is original else None)
 
     # -------------------------------------------------
     # 4. Roman bullets (ONLY if NOT part of Statement)
-    # -------------------------------------------------
-    text = re.sub(
-        r"(?<!Statement )(?<!\n)\b(I|II|III|IV|V|VI|VII|VIII|IX|X)\.",
-        r"\n\1.",
-        text
-    )
-
-    # -------------------------------------------------
     # 5. Numeric bullets
     #    Only treat 1- or 2-digit numbers as bullets to
     #    avoid turning years like "1961." into a new line.
     # -------------------------------------------------
-    text = re.sub(
-        r"(?<!\n)(\b\d{1,2}\.)",
-        r"\n\1",
-        text
-    )
+    if "." in text:
+        text = _RE_ROMAN_BULLET.sub(r"\n\1.", text)
+        text = _RE_NUM_BULLET.sub(r"\n\1", text)
 
     # -------------------------------------------------
     # 6. Cleanup
     # -------------------------------------------------
-    text = re.sub(r"\n{2,}", "\n\n", text)
+    if not cleanup:
+        return text
+
+    if "\n\n\n" in text:
+        text = _RE_MULTI_NL.sub("\n\n", text)
 
     return text.strip()
 
 
 
 
+# "consider the following statements" header OR a Statement I / II label.
+# The two never overlap, so one pass handles both.
+_RE_CONSIDER_OR_STMT = re.compile(
+    r"(consider the following statements[:]?)|Statement\s*[-:]?\s*(II|I)\b",
+    re.IGNORECASE
+)
+_RE_ROMAN = re.compile(r"(?<!Statement )\s+\b(I|II|III|IV|V)\.")
+# Only match 1-2 digit numeric bullets so years like "1961." are not treated as bullets
+_RE_NUM = re.compile(r"(?m)(^|\n)\s*(\d{1,2}\.)")
+
+
+def _consider_or_stmt(match):
+    if match.group(1):
+        return match.group(1) + "\n"
+    # literal numeral: IGNORECASE also matches "ı" / "İ", which
+    # .upper() would not turn into "I"
+    return "Statement II" if len(match.group(2)) == 2 else "Statement I"
+
+
 def _apply_linebreaks(text: str) -> str:
     if not text:
         return text
 
-    text = re.sub(
-        r"(consider the following statements[:]?)",
-        r"\1\n",
-        text,
-        flags=re.IGNORECASE
-    )
+    text = _RE_CONSIDER_OR_STMT.sub(_consider_or_stmt, text)
 
-    text = re.sub(r"Statement\s*[-:]?\s*I\b", "Statement I", text, flags=re.IGNORECASE)
-    text = re.sub(r"Statement\s*[-:]?\s*II\b", "Statement II", text, flags=re.IGNORECASE)
+    # roman / numeric bullets see the output of the pass above
+    # (e.g. "Statement-I." → "Statement I."), so they stay separate passes
+    text = _RE_ROMAN.sub(r"\n\1.", text)
+    text = _RE_NUM.sub(r"\n\2", text)
 
-    text = re.sub(r"(?<!Statement )\s+\b(I|II|III|IV|V)\.", r"\n\1.", text)
-    # Only match 1-2 digit numeric bullets so years like "1961." are not treated as bullets
-    text = re.sub(r"(?m)(^|\n)\s*(\d{1,2}\.)", r"\n\2", text)
-
-    text = re.sub(r"\n{2,}", "\n", text)
+    if "\n\n" in text:
+        text = _RE_MULTI_NL.sub("\n", text)
 
     return text.strip()
 
 
-def _postprocess_question(q_text: str, q_format: str) -> str:
-    if q_format == "table":
-        q_text = table_formatter.format(q_text)
-    
-    if q_format == "match":
-        q_text = match_formatter.format(q_text)
-
+def _format_question(raw_q: str, q_format: str) -> str:
+    """
+    Format-aware reconstruction + formatting, one branch per format.
+    """
     if q_format == "statement":
+        q_text = reconstruct_text(raw_q)
+        q_text = _apply_statement_linebreaks(q_text, cleanup=False)
         q_text = _apply_linebreaks(q_text)
 
-    if q_format == "assertion":
-        q_text = q_text.replace("Reason (R):", "\nReason (R):")
+    elif q_format == "table":
+        q_text = _table_formatter().format(reconstruct_text(raw_q))
+
+    elif q_format == "match":
+        q_text = _match_formatter().format(reconstruct_text(raw_q))
+
+    elif q_format == "assertion":
+        q_text = reconstruct_text(raw_q).replace("Reason (R):", "\nReason (R):")
+
+    else:
+        q_text = raw_q
 
     return q_text.strip()
 
 
-def _postprocess_options(options: dict) -> dict:
-    cleaned = {}
-    for key, val in options.items():
-        if not val:
-            cleaned[key] = ""
+_OPTION_LETTERS = ("A", "B", "C", "D", "E")
+
+
+def _finalize_options(raw_options) -> dict:
+    """
+    normalize_options + OCR fix + strip in ONE walk over the raw
+    options: {"(a)": " ll of these"} → {"A": "All of these"}.
+    """
+    if not isinstance(raw_options, dict):
+        return {}
+
+    option_normalizer = _option_normalizer()
+    clean_value = option_normalizer._clean_option_value
+    fix = _ocr_fixer().fix_option
+
+    # Common case: keys are already A-E in order → fix values in place,
+    # only storing values that actually changed (clean OCR is untouched)
+    if list(raw_options) == [letter for letter in _OPTION_LETTERS if letter in raw_options]:
+        for key, value in raw_options.items():
+            val = clean_value(value).strip()
+            fixed = fix(val).strip() if val else ""
+            if fixed is not value:
+                raw_options[key] = fixed
+        return raw_options
+
+    label_pat = option_normalizer.option_label_pat
+
+    by_label = {}
+    for raw_key, value in raw_options.items():
+        m = label_pat.match(str(raw_key).strip())
+        if not m:
             continue
-        cleaned[key] = ocr_fixer.fix_option(val).strip()
-    return cleaned
+
+        val = clean_value(value).strip()
+        by_label[m.group(1).upper()] = fix(val).strip() if val else ""
+
+    # Sort by letter
+    return {letter: by_label[letter] for letter in _OPTION_LETTERS if letter in by_label}
+
+
+def _finalize(parsed: dict, block, tag: str, idx: int, raw_q: str, q_format: str) -> dict:
+    """
+    Turn one sanitized LLM response into a dataset question (in place).
+    """
+
+    # Check both raw question and original block text for pipes
+    # (pipes might be lost during LLM reconstruction, so check original block too)
+    # If format is match but original block had pipes, it's actually a table
+    if q_format == "match" and isinstance(block, str) and "|" in block:
+        q_format = "table"
+
+    q_text = _format_question(raw_q, q_format)
+    options = _finalize_options(parsed.get("options", {}))
+
+    # -------------------------------
+    # ENSURE REQUIRED TAGS EXIST
+    # -------------------------------
+    parsed.setdefault("subject", None)
+    parsed.setdefault("topic", None)
+    parsed.setdefault("sub_topic", None)
+    parsed.setdefault("keywords", [])
+
+    # Validate and normalize correct_answer from LLM
+    # LLM should provide "A", "B", "C", "D", or "E"
+    if parsed.get("correct_answer") is not None:
+        # Normalize the answer: convert to string, strip, uppercase
+        answer = str(parsed["correct_answer"]).strip().upper()
+        if answer in _OPTION_LETTERS:
+            parsed["correct_answer"] = answer
+        else:
+            # Invalid format - LLM provided something unexpected
+            print(f"[WARNING] Invalid correct_answer format for {parsed.get('id', 'unknown')}: {answer}. Setting to None.")
+            parsed["correct_answer"] = None
+    else:
+        # LLM didn't provide correct_answer (shouldn't happen with updated prompt)
+        parsed["correct_answer"] = None
+
+    parsed.setdefault("is_multi_correct", False)
+
+    # -------------------------------
+    # FINAL ASSIGNMENTS
+    # -------------------------------
+    parsed["question"] = q_text
+    parsed["options"] = options
+    parsed["format"] = q_format
+    parsed["id"] = make_id(tag, idx)
+
+    parsed.pop("number", None)
+
+    return parsed
 
 
 # -----------------------------------------------------
 # MAIN PIPELINE
 # -----------------------------------------------------
 
-def build_dataset(ocr_files, output_file):
+async def _parse_blocks(blocks, tag, sem, inflight=None):
+    """
+    Send all blocks of a column to the LLM concurrently.
+    Identical blocks (same request → same cache key) are sent once,
+    also across the columns that share `inflight` (cache key → task).
+    Returns raw responses in block order.
+    """
+    if inflight is None:
+        inflight = {}
+
+    async def parse_one(idx, block):
+        async with sem:
+            print(f"[LLM] Parsing block {idx} for {tag}")
+            return await parse_block_async(block, f"{tag}_block{idx}")
+
+    keys = [cache_key(block, f"{tag}_block{idx}") for idx, block in enumerate(blocks, start=1)]
 
-    final_dataset = []
+    for idx, (key, block) in enumerate(zip(keys, blocks), start=1):
+        if key not in inflight:
+            inflight[key] = asyncio.ensure_future(parse_one(idx, block))
 
-    for file_path in ocr_files:
+    return list(await asyncio.gather(*(inflight[key] for key in keys)))
 
-        tag = os.path.basename(file_path).replace(".txt", "")
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            col_text = f.read().strip()
+def _process_column(tag, blocks, raw_jsons):
+    """
+    Sanitize + postprocess the LLM responses of one column.
+    Returns the column's questions in block order.
+    """
+    items = []
+    for idx, (block, raw_json) in enumerate(zip(blocks, raw_jsons), start=1):
 
-        print(f"\n[SEGMENT] Processing column → {tag}")
-        blocks = segment_column(col_text, tag)
+        parsed = sanitize_and_load(raw_json)
 
-        if not blocks:
+        if not isinstance(parsed, dict):
             continue
 
+        items.append((idx, block, parsed))
+
+    # -------------------------------
+    # BASIC FIELDS (whole column at once)
+    # -------------------------------
+    raw_qs = [parsed.get("question", "").strip() for _, _, parsed in items]
+
+    # FORMAT DETECTION MUST HAPPEN FIRST
+    # Use raw_q for format detection, but also check original block for pipes
+    q_formats = _classifier().classify_batch(raw_qs)
+
+    return [
+        _finalize(parsed, block, tag, idx, raw_q, q_format)
+        for (idx, block, parsed), raw_q, q_format in zip(items, raw_qs, q_formats)
+    ]
+
+
+def _read_column(file_path):
+    """
+    Read and segment ONE OCR column file → (tag, blocks).
+    Blocking (disk + segmentation LLM call); run it off the event loop.
+    """
+    path = Path(file_path)
+    tag = path.stem
+
+    col_text = path.read_text(encoding="utf-8").strip()
+
+    print(f"\n[SEGMENT] Processing column → {tag}")
+    return tag, segment_column(col_text, tag)
+
+
+def _read_columns(ocr_files, num_parallel=GROQ_NUM_PARALLEL):
+    """
+    Yield (tag, blocks) for every OCR column that segments into blocks.
+    Files are read and segmented num_parallel at a time in
+    threads; columns are still yielded in file order.
+    """
+    with ThreadPoolExecutor(max_workers=num_parallel) as pool:
+        for tag, blocks in pool.map(_read_column, ocr_files):
+            if blocks:
+                yield tag, blocks
+
+
+def _build_batched(ocr_files, num_parallel=GROQ_NUM_PARALLEL):
+    """
+    Offline path: segment every column first, parse ALL blocks
+    through one Groq Batch API job, then postprocess.
+    Yields each column's questions.
+    """
+    columns = list(_read_columns(ocr_files, num_parallel))
+
+    # cached blocks never enter the batch; duplicates are sent once
+    results = {}
+    keys = {}
+    requested = {}   # cache key → custom_id actually sent
+    requests = []
+    for tag, blocks in columns:
         for idx, block in enumerate(blocks, start=1):
-
-            print(f"[LLM] Parsing block {idx} for {tag}")
-            raw_json = parse_block(block, f"{tag}_block{idx}")
-            parsed = sanitize_and_load(raw_json)
-
-            if not isinstance(parsed, dict):
+            block_tag = f"{tag}_block{idx}"
+            key = keys[block_tag] = cache_key(block, block_tag)
+
+            cached = cache_get(key)
+            if cached is not None:
+                results[block_tag] = cached
+            elif key not in requested:
+                requested[key] = block_tag
+                requests.append(groq_batch.make_request(block, block_tag))
+
+    if requests:
+        fetched = groq_batch.run_batches(requests)
+        for block_tag, content in fetched.items():
+            cache_put(keys[block_tag], content)
+
+        for block_tag, key in keys.items():
+            if key in requested:
+                results[block_tag] = fetched.get(requested[key])
+
+    for tag, blocks in columns:
+        raw_jsons = [results.get(f"{tag}_block{idx}") for idx in range(1, len(blocks) + 1)]
+        yield _process_column(tag, blocks, raw_jsons)
+
+
+# orjson decodes integers wider than 64 bits as floats: lines with
+# a digit run this long go to the stdlib, which keeps them exact
+_RE_LONG_DIGITS = re.compile(rb"\d{19}")
+
+
+def _loads(line):
+    if orjson is not None and not _RE_LONG_DIGITS.search(line):
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError:  # e.g. NaN or lone surrogates: let stdlib decide
+            pass
+    return json.loads(line)
+
+
+def _dumps(obj, indent=False) -> bytes:
+    """
+    UTF-8 JSON bytes (orjson when available). indent=False gives one
+    JSONL line, indent=True the json.dump(indent=2) layout.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        option |= orjson.OPT_INDENT_2 if indent else orjson.OPT_APPEND_NEWLINE
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:  # orjson.JSONEncodeError: stdlib handles the edge cases
+            pass
+
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def convert_jsonl_to_json(jsonl_file, json_file):
+    """
+    Stream a JSONL dataset into the indented JSON array
+    downstream tools expect, one question in memory at a time.
+    Output matches json.dump(..., indent=2, ensure_ascii=False).
+    """
+    with open(jsonl_file, "rb") as f_in, \
+            open(json_file, "wb", buffering=1 << 20) as f_out:
+
+        first = True
+        for line in f_in:
+            if not line.strip():
                 continue
 
-            # -------------------------------
-            # BASIC FIELDS
-            # -------------------------------
-            raw_q = parsed.get("question", "").strip()
-            options = normalize_options(parsed.get("options", {}))
-
-            # FORMAT DETECTION MUST HAPPEN FIRST
-            # Check both raw question and original block text for pipes
-            # (pipes might be lost during LLM reconstruction, so check original block too)
-            block_text_for_format = block if isinstance(block, str) else ""
-            # Use raw_q for format detection, but also check original block for pipes
-            q_format = format_classifier.classify(raw_q)
-            # If format is match but original block had pipes, it's actually a table
-            # This handles cases where LLM loses pipes during reconstruction
-            if q_format == "match" and "|" in block_text_for_format:
-                q_format = "table"
-
-            # FORMAT-AWARE RECONSTRUCTION
-            if q_format == "statement":
-                q_text = reconstruct_text(raw_q)
-                q_text = _apply_statement_linebreaks(q_text)
-
-            elif q_format in ("match", "table", "assertion"):
-                q_text = reconstruct_text(raw_q)
-
-            else:
-                q_text = raw_q
-            
-            # Apply format-specific formatting
-            q_text = _postprocess_question(q_text, q_format)
-
-            options = _postprocess_options(options)
-
-
-            # -------------------------------
-            # ENSURE REQUIRED TAGS EXIST
-            # -------------------------------
-            parsed.setdefault("subject", None)
-            parsed.setdefault("topic", None)
-            parsed.setdefault("sub_topic", None)
-            parsed.setdefault("keywords", [])
-
-            # Validate and normalize correct_answer from LLM
-            # LLM should provide "A", "B", "C", "D", or "E"
-            valid_answers = ["A", "B", "C", "D", "E"]
-            if "correct_answer" in parsed and parsed.get("correct_answer") is not None:
-                # Normalize the answer: convert to string, strip, uppercase
-                answer = str(parsed.get("correct_answer", "")).strip().upper()
-                if answer in valid_answers:
-                    parsed["correct_answer"] = answer
-                else:
-                    # Invalid format - LLM provided something unexpected
-                    print(f"[WARNING] Invalid correct_answer format for {parsed.get('id', 'unknown')}: {answer}. Setting to None.")
-                    parsed["correct_answer"] = None
-            else:
-                # LLM didn't provide correct_answer (shouldn't happen with updated prompt)
-                parsed["correct_answer"] = None
-            
-            parsed.setdefault("is_multi_correct", False)
-
-            # -------------------------------
-            # FINAL ASSIGNMENTS
-            # -------------------------------
-            parsed["question"] = q_text
-            parsed["options"] = options
-            parsed["format"] = q_format
-            parsed["id"] = make_id(tag, idx)
-
-            parsed.pop("number", None)
-
-            final_dataset.append(parsed)
-
-    # -------------------------------------------------
-    # SAVE JSON
-    # -------------------------------------------------
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            item = _dumps(_loads(line), indent=True)
+            f_out.write(b"[\n  " if first else b",\n  ")
+            f_out.write(item.replace(b"\n", b"\n  "))
+            first = False
+
+        f_out.write(b"[]" if first else b"\n]")
 
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(final_dataset, f, indent=2, ensure_ascii=False)
 
-    print(f"\n[PHASE A COMPLETE] Saved {len(final_dataset)} questions → {output_file}")
+class _DatasetWriter:
+    """
+    Streams questions to <output>.jsonl as columns finish;
+    on success builds the JSON array (unless write_json=False).
+    """
+
+    def __init__(self, output_file, write_json=True):
+        out_path = Path(output_file)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.output_file = output_file
+        self.jsonl_file = str(out_path.with_suffix(".jsonl"))
+        self.write_json = write_json
+        self.total = 0
+        self._f = open(self.jsonl_file, "wb", buffering=1 << 20)
+
+    def write(self, questions):
+        for q in questions:
+            self._f.write(_dumps(q))
+        self.total += len(questions)
+
+        # one flush per column: if the run is killed, every finished
+        # column is already on disk as complete JSONL lines
+        self._f.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._f.close()
+        if exc_type is not None:
+            return False
+
+        # -------------------------------------------------
+        # SAVE JSON
+        # -------------------------------------------------
+        output_file = self.output_file
+        if self.write_json:
+            convert_jsonl_to_json(self.jsonl_file, output_file)
+        else:
+            output_file = self.jsonl_file
+
+        print(f"\n[PHASE A COMPLETE] Saved {self.total} questions → {output_file}")
+        return False
+
+
+async def _process_file_async(file_path, sem, inflight=None):
+    # segmentation shares the LLM concurrency limit with block parsing
+    async with sem:
+        tag, blocks = await asyncio.to_thread(_read_column, file_path)
+
+    if not blocks:
+        return []
+
+    raw_jsons = await _parse_blocks(blocks, tag, sem, inflight)
+    return _process_column(tag, blocks, raw_jsons)
+
+
+def _process_file(file_path, num_parallel=GROQ_NUM_PARALLEL):
+    """
+    Pool worker: segment, parse (own event loop) and
+    postprocess ONE OCR column file.
+    """
+    async def run():
+        try:
+            return await _process_file_async(file_path, asyncio.Semaphore(num_parallel))
+        finally:
+            await close_async_client()
+
+    return asyncio.run(run())
+
+
+async def build_dataset_async(ocr_files, output_file, batch_mode=None, write_json=True,
+                              num_parallel=None):
+
+    if batch_mode is None:
+        batch_mode = GROQ_BATCH_MODE
+    if num_parallel is None:
+        num_parallel = GROQ_NUM_PARALLEL
+
+    with _DatasetWriter(output_file, write_json) as out:
+
+        if batch_mode:
+            for questions in _build_batched(ocr_files, num_parallel):
+                out.write(questions)
+
+        else:
+            sem = asyncio.Semaphore(num_parallel)
+            # repeated blocks (headers, instructions) across columns
+            # and pages are sent once per run
+            inflight = {}
+
+            # All files share one semaphore, so the next file's blocks are
+            # already in flight while the current one is postprocessed.
+            # Results are still written in file order.
+            tasks = [
+                asyncio.create_task(_process_file_async(file_path, sem, inflight))
+                for file_path in ocr_files
+            ]
+
+            try:
+                for task in tasks:
+                    out.write(await task)
+            finally:
+                # shared block requests too: none may outlive the client
+                pending = [*tasks, *inflight.values()]
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                await close_async_client()
+
+
+def build_dataset(ocr_files, output_file, batch_mode=None, write_json=True, max_workers=1,
+                  num_parallel=None):
+    """
+    Sync entry point (run_phase2 / debug scripts).
+    batch_mode=None follows the GROQ_BATCH_MODE env var.
+    write_json=False keeps only the streamed .jsonl file.
+    max_workers > 1 (None → CPU count) processes OCR files in a
+    process pool; num_parallel (None → GROQ_NUM_PARALLEL), the cap on
+    in-flight LLM requests, is split across the workers (so there are
+    never more workers than num_parallel).
+    """
+    if batch_mode is None:
+        batch_mode = GROQ_BATCH_MODE
+    if num_parallel is None:
+        num_parallel = GROQ_NUM_PARALLEL
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    # no more workers than request slots: each gets at least one and
+    # together they never exceed num_parallel
+    max_workers = min(max_workers, len(ocr_files), num_parallel)
+
+    if batch_mode or max_workers <= 1:
+        asyncio.run(build_dataset_async(ocr_files, output_file, batch_mode, write_json, num_parallel))
+        return
+
+    # Files are independent → one column per worker, results kept in order.
+    # "spawn" on every platform: a forked child would inherit locks held
+    # by the parent's threads (cache, logging, HTTP pools); each worker
+    # builds its singletons once at start instead.
+    worker = partial(_process_file, num_parallel=num_parallel // max_workers)
+
+    with _DatasetWriter(output_file, write_json) as out, ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker
+    ) as pool:
+        for questions in pool.map(worker, ocr_files):
+            out.write(questions)
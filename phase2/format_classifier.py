@@ -4,18 +4,99 @@
 # ---------------------------------------------------------
 
 import re
+from functools import lru_cache
+
+try:
+    import ahocorasick
+except ImportError:  # fall back to per-keyword substring checks
+    ahocorasick = None
+
+
+# Lowercase literals the rules look for in the question text
+_KEYWORDS = (
+    "correctly matched",
+    "sequence is correct",
+    "consider the following statements",
+    "assertion",
+    "reason",
+    "read the following",
+    "paragraph",
+    "passage",
+)
+_KW_BIT = {kw: 1 << i for i, kw in enumerate(_KEYWORDS)}
+
+# One mask per rule group: any bit set → that label
+# (assertion needs BOTH of its bits)
+_MATCH_ANY = _KW_BIT["correctly matched"] | _KW_BIT["sequence is correct"]
+_STATEMENT_ANY = _KW_BIT["consider the following statements"]
+_ASSERTION_ALL = _KW_BIT["assertion"] | _KW_BIT["reason"]
+_PARAGRAPH_ANY = (
+    _KW_BIT["read the following"] | _KW_BIT["paragraph"] | _KW_BIT["passage"]
+)
+
+
+def _build_keyword_automaton():
+    """
+    Compile every classifier keyword into one Aho-Corasick automaton.
+    Each keyword maps to its bit in the keyword mask.
+    """
+    if ahocorasick is None:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for kw, bit in _KW_BIT.items():
+        automaton.add_word(kw, bit)
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+_DASHES = ("-", "–", "—")
+
+
+def _keyword_mask(qt: str) -> int:
+    """Bitmask of the _KEYWORDS found in qt (one pass with the automaton)."""
+    mask = 0
+    if _KEYWORD_AUTOMATON is None:
+        for kw, bit in _KW_BIT.items():
+            if kw in qt:
+                mask |= bit
+        return mask
+
+    for _, bit in _KEYWORD_AUTOMATON.iter(qt):
+        mask |= bit
+    return mask
+
 
 class FormatClassifier:
 
-    def classify(self, text: str):
+    roman_pair_pat = re.compile(
+        r"^(I|II|III|IV|V|VI|VII|VIII|IX|X)\.\s+.+\s+:\s+.+", re.MULTILINE
+    )
+    dash_pair_pat = re.compile(r"^\d+\.\s+.+\s+[-–—]\s+.+", re.MULTILINE)
+    numeric_bullet_pat = re.compile(r"\b\d+\.")
+    roman_bullet_pat = re.compile(r"\b(I|II|III|IV|V)\.")
+
+    @staticmethod
+    def _at_least_two(pat, text: str) -> bool:
+        """len(pat.findall(text)) >= 2, stopping at the second match."""
+        matches = pat.finditer(text)
+        return next(matches, None) is not None and next(matches, None) is not None
 
+    def classify(self, text: str):
+        return self._classify_cached(text)
+
+    @classmethod
+    @lru_cache(maxsize=8192)
+    def _classify_cached(cls, text: str):
+        """
+        The rules are a pure function of the text, so repeated
+        question stems are classified once per process.
+        """
         if not text:
             return "single"
 
-        qt = text.lower()
-
-        lines = [ln.strip() for ln in text.split("\n") if ln.strip()]
-
         # ----------------------------------------------------
         # 1. TABLE (HIGHEST PRIORITY - Check for structured tables)
         # ----------------------------------------------------
@@ -24,64 +105,67 @@ class FormatClassifier:
         if "|" in text:
             return "table"
 
+        mask = _keyword_mask(text.lower())
+
+        # Every pair / bullet match contains a ".", and each of those
+        # rules needs two matches: short one-line questions skip them all
+        dots = text.count(".")
+        multi_dot = dots >= 2
+
         # ----------------------------------------------------
         # 2. MATCH / PAIRS (Check after table to avoid misclassification)
         # ----------------------------------------------------
-        # Rule 0: "correctly matched" - but only if NOT already classified as table
-        if re.search(r"correctly matched", qt):
+        # Rule 0 + 3: "correctly matched" / "sequence is correct" - but only
+        # if NOT already classified as table. Every rule here returns
+        # "match", so the keyword bits are tested before the pair scans.
+        if mask & _MATCH_ANY:
             return "match"
 
         # Rule 1: Roman numeral colon pairs (I. X : Y format)
-        roman_pairs = re.findall(
-            r"^(I|II|III|IV|V|VI|VII|VIII|IX|X)\.\s+.+\s+:\s+.+",
-            text,
-            flags=re.MULTILINE
-        )
-        if len(roman_pairs) >= 2:
+        if multi_dot and ":" in text and cls._at_least_two(cls.roman_pair_pat, text):
             return "match"
 
         # Rule 2: Numbered dash pairs
-        dash_pairs = re.findall(
-            r"^\d+\.\s+.+\s+[-–—]\s+.+",
-            text,
-            flags=re.MULTILINE
-        )
-        if len(dash_pairs) >= 2:
-            return "match"
-
-        # Rule 3: Sequence matching
-        if "sequence is correct" in qt:
+        if multi_dot and any(d in text for d in _DASHES) and cls._at_least_two(cls.dash_pair_pat, text):
             return "match"
 
-
         # ----------------------------------------------------
         # 3. STATEMENT QUESTIONS
         # ----------------------------------------------------
-        if "consider the following statements" in qt:
+        if mask & _STATEMENT_ANY:
             return "statement"
 
-        if len(re.findall(r"\b\d+\.", text)) >= 2:
+        if multi_dot and cls._at_least_two(cls.numeric_bullet_pat, text):
             return "statement"
 
-        if len(re.findall(r"\b(I|II|III|IV|V)\.", text)) >= 2:
+        if multi_dot and cls._at_least_two(cls.roman_bullet_pat, text):
             return "statement"
 
         # ----------------------------------------------------
         # 4. ASSERTION – REASON
         # ----------------------------------------------------
-        if "assertion" in qt and "reason" in qt:
+        if mask & _ASSERTION_ALL == _ASSERTION_ALL:
             return "assertion"
 
         # ----------------------------------------------------
         # 5. PARAGRAPH
         # ----------------------------------------------------
-        if any(k in qt for k in ["read the following", "paragraph", "passage"]):
+        if mask & _PARAGRAPH_ANY:
             return "paragraph"
 
-        if text.count(".") >= 5:
+        if dots >= 5:
             return "paragraph"
 
         # ----------------------------------------------------
         # DEFAULT
         # ----------------------------------------------------
         return "single"
+
+    def classify_batch(self, texts):
+        """
+        classify() for a whole column of questions in one call.
+        Rules are priority-ordered per text, so each text is still
+        walked on its own; this only drops per-question call overhead.
+        """
+        classify = self.classify
+        return [classify(t) for t in texts]
@@ -2,34 +2,45 @@
 
 import re
 
-def clean_ocr_text(raw_text):
-    """Normalize OCR noise and join broken lines safely."""
+# question number ("12.") or option label ("A)") at line start
+_LINE_KIND_PAT = re.compile(r"(?P<qnum>\d+\.)|(?P<opt>[A-D]\))")
+
 
-    # remove empty lines
-    lines = [ln.strip() for ln in raw_text.split("\n") if ln.strip()]
+def iter_ocr_blocks(raw_text):
+    """Yield cleaned question blocks one at a time as their boundaries are found."""
 
     # join lines that do NOT start with option labels or question numbers
-    cleaned = []
-    buf = ""
+    buf = []   # pieces of the current block, joined once at the boundary
 
-    for ln in lines:
+    for ln in raw_text.split("\n"):
+
+        # skip empty lines
+        ln = ln.strip()
+        if not ln:
+            continue
+
+        m = _LINE_KIND_PAT.match(ln)
+        kind = m.lastgroup if m else None
 
         # If line starts with question number -> start new block
-        if re.match(r"^\d+\.", ln):
+        if kind == "qnum":
             if buf:
-                cleaned.append(buf.strip())
-            buf = ln
+                yield "".join(buf).strip()
+            buf = [ln]
             continue
 
         # If line starts with option label (A/B/C/D)
-        if re.match(r"^[A-D]\)", ln):
-            buf += "\n" + ln
+        if kind == "opt":
+            buf += ("\n", ln)
             continue
 
         # Otherwise: continuation line
-        buf += " " + ln
+        buf += (" ", ln)
 
     if buf:
-        cleaned.append(buf.strip())
+        yield "".join(buf).strip()
+
 
-    return cleaned
+def clean_ocr_text(raw_text):
+    """Normalize OCR noise and join broken lines safely."""
+    return list(iter_ocr_blocks(raw_text))
@@ -0,0 +1,113 @@
+# phase2/groq_batch.py
+# ------------------------------------------------------
+# GROQ BATCH API (OFFLINE BLOCK PARSING)
+# ------------------------------------------------------
+# - Uploads every block request as ONE JSONL file
+# - Submits it as a batch job and polls until done
+# - Returns raw LLM responses keyed by custom_id
+# ------------------------------------------------------
+
+import time
+
+from phase2.block_parser import client, _request_kwargs, _dumps, _loads
+
+# Groq accepts at most this many requests per batch file
+MAX_BATCH_REQUESTS = 50000
+
+POLL_INTERVAL = 30   # seconds
+
+_FAILED_STATUSES = ("failed", "expired", "cancelled")
+
+
+def make_request(block_text: str, tag: str) -> dict:
+    """
+    One batch line: same body parse_block would send,
+    keyed by the block tag.
+    """
+    return {
+        "custom_id": tag,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": _request_kwargs(block_text, tag),
+    }
+
+
+def submit_batch(requests: list) -> str:
+    """
+    Upload requests as JSONL and start a batch job.
+
+    Returns:
+        batch id
+    """
+    jsonl = b"\n".join(_dumps(r) for r in requests)
+
+    batch_file = client.files.create(
+        file=("blocks.jsonl", jsonl),
+        purpose="batch"
+    )
+
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+
+    print(f"[BATCH] Submitted {len(requests)} requests → {batch.id}")
+    return batch.id
+
+
+def poll_and_fetch(batch_id: str, poll_interval: int = POLL_INTERVAL) -> dict:
+    """
+    Wait for a batch to finish and download its output.
+
+    Returns:
+        {custom_id: raw LLM response}; failed requests are left out
+    """
+    while True:
+        batch = client.batches.retrieve(batch_id)
+
+        if batch.status == "completed":
+            break
+        if batch.status in _FAILED_STATUSES:
+            raise RuntimeError(f"[BATCH ERROR] {batch_id} ended with status: {batch.status}")
+
+        print(f"[BATCH] {batch_id} status: {batch.status}")
+        time.sleep(poll_interval)
+
+    results = {}
+    if not batch.output_file_id:
+        return results
+
+    content = client.files.content(batch.output_file_id).read()
+
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+
+        item = _loads(line)
+        response = item.get("response") or {}
+
+        if item.get("error") or response.get("status_code") != 200:
+            print(f"[BATCH WARNING] Request failed: {item.get('custom_id')}")
+            continue
+
+        results[item["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+
+    return results
+
+
+def run_batches(requests: list) -> dict:
+    """
+    Submit requests in chunks of MAX_BATCH_REQUESTS (all chunks
+    queued before polling) and merge their results into one dict.
+    """
+    batch_ids = [
+        submit_batch(requests[start:start + MAX_BATCH_REQUESTS])
+        for start in range(0, len(requests), MAX_BATCH_REQUESTS)
+    ]
+
+    results = {}
+    for batch_id in batch_ids:
+        results.update(poll_and_fetch(batch_id))
+
+    return results
@@ -13,29 +13,56 @@
 import json
 import re
 
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json
+    orjson = None
+
+
+# Control characters to drop (keeps \n)
+_CTRL_PAT = re.compile(r"[\x00-\x09\x0B-\x1F\x7F]")
+_CTRL_DELETE = dict.fromkeys([*range(0x00, 0x0A), *range(0x0B, 0x20), 0x7F])
+
+_JSON_OPEN_PAT = re.compile(r"[\[{]")
+
+# orjson decodes integers wider than 64 bits as floats; any digit run
+# this long may be one, so such text goes to the stdlib (exact ints)
+_LONG_DIGITS_PAT = re.compile(r"\d{19}")
+
 
 def sanitize_and_load(s: str):
     if not isinstance(s, str):
         return None
 
-    # Remove control characters (safe)
-    s = re.sub(r"[\x00-\x09\x0B-\x1F\x7F]", "", s)
+    # Remove control characters (safe). translate() is the fast path
+    # for ASCII text only; on other text it is slower than the regex.
+    s = s.translate(_CTRL_DELETE) if s.isascii() else _CTRL_PAT.sub("", s)
 
-    # Detect JSON start (object or array)
-    start_obj = s.find("{")
-    start_arr = s.find("[")
-    start = min(x for x in [start_obj, start_arr] if x != -1)
+    # Detect JSON start (object or array): one scan, stops at the
+    # first opener (a find per bracket walks the whole text when
+    # one kind is missing)
+    m = _JSON_OPEN_PAT.search(s)
+    start = m.start() if m else -1
 
-    # Detect JSON end (object or array)
-    end_obj = s.rfind("}")
-    end_arr = s.rfind("]")
-    end = max(end_obj, end_arr)
+    # Detect JSON end (object or array): almost always the last
+    # non-blank char; only search backwards when it is not
+    end = len(s) - 1
+    while end >= 0 and s[end].isspace():
+        end -= 1
+    if end >= 0 and s[end] not in "}]":
+        end = max(s.rfind("}"), s.rfind("]"))
 
     if start == -1 or end == -1 or end <= start:
         return None
 
     json_str = s[start : end + 1].strip()
 
+    if orjson is not None and not _LONG_DIGITS_PAT.search(json_str):
+        try:
+            return orjson.loads(json_str)
+        except orjson.JSONDecodeError:
+            pass  # NaN, lone surrogates: stdlib is more lenient
+
     try:
         return json.loads(json_str)
     except json.JSONDecodeError:
@@ -15,7 +15,74 @@ class MatchFormatter:
     - "Consider the following Country Resource-rich in I Botswana Diamond II. Chile Lithium..."
     - "Consider the following Region Country I. Mallorca Italy II. Normandy Spain..."
     """
-    
+
+    # Options merged into the question: "(a) text", "a) text" ... to end
+    # ASCII characters that only Unicode \s treats as whitespace
+    # (file/group/record/unit separators): they rule out the re.ASCII twin
+    info_sep_pat = re.compile(r"[\x1c-\x1f]")
+
+    option_tail_pat = re.compile(r"\s*\(?[a-eA-E]\)\s+.*$", re.IGNORECASE)
+    consider_pat = re.compile(r"(consider the following)\s+", re.IGNORECASE)
+    # "I ", "I. ", "II ", "II. ", etc. (but not "Statement I")
+    roman_pat = re.compile(r"(?<!Statement )\b(I|II|III|IV|V|VI|VII|VIII|IX|X)\.?\s+", re.IGNORECASE)
+
+    # Question text inside a pair's content, in priority order
+    question_markers = (
+        r"in\s+how\s+many\s+of\s+the",  # "In how many of the"
+        r"how\s+many\s+of\s+the",       # "How many of the"
+        r"which\s+of\s+the\s+above",    # "Which of the above"
+        r"in\s+which\s+of\s+the",       # "In which of the"
+    )
+    question_pats = tuple(re.compile(p, re.IGNORECASE) for p in question_markers)
+    # Question text after the last pair
+    question_marker_pat = re.compile(
+        r"(in\s+how\s+many|how\s+many\s+of\s+the|in\s+which|which\s+of\s+the|what)",
+        re.IGNORECASE
+    )
+    question_word_pat = re.compile(r"^(in|how|which|what|when|where)", re.IGNORECASE)
+
+    # Pair cleanup
+    dot_colon_pat = re.compile(r"\s*\.+\s*:\s*")     # " . :" / ".. :" -> " : "
+    lead_colon_pat = re.compile(r"^\s*:\s*")          # ": Sardinia France"
+    colon_space_pat = re.compile(r"\s+:\s+")
+
+    romans = ("I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X")
+
+    # Final cleanup
+    multi_space_pat = re.compile(r" {2,}")
+    multi_nl_pat = re.compile(r"\n{3,}")
+    # once space runs are collapsed, a newline has at most one space on
+    # each side: drop both in one pass
+    space_nl_pat = re.compile(r" \n ?|\n ")
+
+    # Set on the re.ASCII twin below
+    ascii_only = False
+
+    def _question_start(self, rest: str):
+        """
+        Start of the first question marker in rest (markers tried in
+        priority order), or None.
+        """
+        # Every marker contains "of": pair content usually doesn't,
+        # so one substring check replaces the four searches
+        if "of" not in rest.lower():
+            return None
+
+        for pat in self.question_pats:
+            m = pat.search(rest)
+            if m:
+                return m.start()
+
+        return None
+
+    @staticmethod
+    def _pair(roman: str, words: list) -> str:
+        """
+        "I. first : rest" from a pair's words (len(words) >= 2).
+        The first word is the first item, the rest the second item.
+        """
+        return f"{roman}. {words[0]} : {' '.join(words[1:])}"
+
     def format(self, text: str) -> str:
         """
         Format match question text with proper line breaks.
@@ -36,43 +103,39 @@ class MatchFormatter:
         if not text:
             return text
         
+        # Pure-ASCII text goes through the re.ASCII twin of the patterns:
+        # cheaper \b / \s / case tests, identical matches on ASCII input
+        # unless it holds \x1c-\x1f (whitespace to Unicode \s only)
+        if text.isascii() and not self.ascii_only and not self.info_sep_pat.search(text):
+            return _ASCII_FORMATTER.format(text)
+        
         text = text.strip()
         
         # Step 0: Remove options that got merged into question text
         # Options typically appear as "(a) text", "(b) text", etc. or "a) text", "b) text"
         # Remove everything from first option marker to end
-        option_pattern = r"\s*\(?[a-eA-E]\)\s+.*$"
-        text = re.sub(option_pattern, "", text, flags=re.IGNORECASE)
+        text = self.option_tail_pat.sub("", text)
         text = text.strip()
         
         # Step 1: Add newline after "Consider the following" if not already present
-        text = re.sub(
-            r"(consider the following)\s+",
-            r"\1\n",
-            text,
-            flags=re.IGNORECASE,
-            count=1
-        )
+        text = self.consider_pat.sub(r"\1\n", text, count=1)
         
         # Step 2: Find all Roman numeral markers (I, II, III, etc.)
         # Pattern matches: "I ", "I. ", "II ", "II. ", etc. (but not "Statement I")
-        roman_pattern = r"(?<!Statement )\b(I|II|III|IV|V|VI|VII|VIII|IX|X)\.?\s+"
-        
         # Find all positions where Roman numerals start
-        matches = list(re.finditer(roman_pattern, text, re.IGNORECASE))
+        matches = list(self.roman_pat.finditer(text))
         
         if not matches:
             # No Roman numerals found, return as-is (might not be a match question)
             return text
         
         # Step 3: Process all pairs - be more careful about detecting question text
-        parts = []
+        # Each section collects its own lines (header, pairs, question)
+        pairs = []
+        questions = []
         
         # Extract header (everything before first Roman numeral)
-        if matches:
-            header = text[:matches[0].start()].strip()
-            if header:
-                parts.append(("header", header))
+        header = text[:matches[0].start()].strip()
         
         # Process each Roman numeral match
         question_start_idx = None
@@ -98,25 +161,13 @@ class MatchFormatter:
             rest = content[len(match.group(0)):].strip()
             
             # Check if this content contains question text
-            # Question patterns to look for
-            question_patterns = [
-                r"in\s+how\s+many\s+of\s+the",  # "In how many of the"
-                r"how\s+many\s+of\s+the",       # "How many of the"
-                r"which\s+of\s+the\s+above",    # "Which of the above"
-                r"in\s+which\s+of\s+the",       # "In which of the"
-            ]
-            
-            question_match = None
-            for pattern in question_patterns:
-                question_match = re.search(pattern, rest, re.IGNORECASE)
-                if question_match:
-                    break
+            question_start = self._question_start(rest)
             
-            if question_match:
+            if question_start is not None:
                 # This content contains both pair data and question text
                 # Split them properly
-                pair_part = rest[:question_match.start()].strip()
-                question_text = rest[question_match.start():].strip()
+                pair_part = rest[:question_start].strip()
+                question_text = rest[question_start:].strip()
                 
                 # First, format the current pair (this Roman numeral)
                 # Typically a pair is 2 words (e.g., "Chile Lithium")
@@ -126,101 +177,90 @@ class MatchFormatter:
                 if len(words) >= 2:
                     # Check if this looks like multiple pairs or just one
                     # If we have 4+ words, it might be 2 pairs (e.g., "Chile Lithium Indonesia Nickel")
-                    existing_pairs = [p for p in parts if p[0] == "pair"]
-                    
                     if len(words) >= 4:
                         # Likely two pairs: extract first pair for current Roman, second for next
                         first_pair_words = words[:2]  # First 2 words
                         second_pair_words = words[2:]  # Remaining words
                         
                         # Format current pair
-                        formatted_pair = f"{roman}. {first_pair_words[0]} : {first_pair_words[1]}"
-                        parts.append(("pair", formatted_pair))
+                        formatted_pair = self._pair(roman, first_pair_words)
+                        pairs.append(formatted_pair)
                         
                         # Format orphaned pair
-                        next_roman = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X"][len(existing_pairs) + 1]
+                        # (the current pair is already counted)
+                        next_roman = self.romans[len(pairs)]
                         if len(second_pair_words) >= 2:
-                            formatted_orphan = f"{next_roman}. {second_pair_words[0]} : {' '.join(second_pair_words[1:])}"
+                            formatted_orphan = self._pair(next_roman, second_pair_words)
                         else:
                             formatted_orphan = f"{next_roman}. {' '.join(second_pair_words)}"
-                        parts.append(("pair", formatted_orphan))
+                        pairs.append(formatted_orphan)
                     else:
                         # Single pair - format normally
                         # Clean up malformed patterns like " . :" or " .. :"
-                        pair_part = re.sub(r"\s*\.+\s*:\s*", " : ", pair_part)  # Clean " . :" -> " : "
-                        pair_part = re.sub(r"^\s*:\s*", "", pair_part)  # Remove leading colon with spaces
+                        pair_part = self.dot_colon_pat.sub(" : ", pair_part)  # Clean " . :" -> " : "
+                        pair_part = self.lead_colon_pat.sub("", pair_part)  # Remove leading colon with spaces
                         pair_part = pair_part.strip()
                         
                         if ":" in pair_part:
                             # Colon present - split and format
-                            colon_parts = pair_part.split(":", 1)
-                            if len(colon_parts) == 2:
-                                first_part = colon_parts[0].strip()
-                                second_part = colon_parts[1].strip()
-                                # If first part is empty (malformed like ": Sardinia France"), treat second part as two words
-                                if not first_part and second_part:
-                                    second_words = second_part.split()
-                                    if len(second_words) >= 2:
-                                        formatted_pair = f"{roman}. {second_words[0]} : {' '.join(second_words[1:])}"
-                                    else:
-                                        formatted_pair = f"{roman}. {second_part}"
+                            first_part, _, second_part = pair_part.partition(":")
+                            first_part = first_part.strip()
+                            second_part = second_part.strip()
+                            # If first part is empty (malformed like ": Sardinia France"), treat second part as two words
+                            if not first_part and second_part:
+                                second_words = second_part.split()
+                                if len(second_words) >= 2:
+                                    formatted_pair = self._pair(roman, second_words)
                                 else:
-                                    formatted_pair = f"{roman}. {first_part} : {second_part}"
+                                    formatted_pair = f"{roman}. {second_part}"
                             else:
-                                formatted_pair = f"{roman}. {pair_part}".replace(" :", " :").replace(": ", " : ")
+                                formatted_pair = f"{roman}. {first_part} : {second_part}"
                         else:
-                            first_item = words[0]
-                            second_item = " ".join(words[1:])
-                            formatted_pair = f"{roman}. {first_item} : {second_item}"
-                        parts.append(("pair", formatted_pair))
+                            formatted_pair = self._pair(roman, words)
+                        pairs.append(formatted_pair)
                 elif pair_part:
                     # Single word or weird format - just add it
                     formatted_pair = f"{roman}. {pair_part}"
-                    parts.append(("pair", formatted_pair))
+                    pairs.append(formatted_pair)
                 
                 # Extract and clean question text
-                question_text = re.sub(r"\s*\(?[a-eA-E]\)\s+.*$", "", question_text, flags=re.IGNORECASE)
+                question_text = self.option_tail_pat.sub("", question_text)
                 if question_text:
-                    parts.append(("question", question_text))
+                    questions.append(question_text)
                 question_start_idx = i
                 break
             
             # This is just a pair - format it
             # Clean up malformed patterns like " . :" or " .. :"
-            rest = re.sub(r"\s*\.+\s*:\s*", " : ", rest)  # Clean " . :" or ".. :" -> " : "
-            rest = re.sub(r"^\s*:\s*", "", rest)  # Remove leading colon with spaces (malformed like ": Sardinia France")
-            rest = re.sub(r"\s+:\s+", " : ", rest)  # Normalize colon spacing
+            rest = self.dot_colon_pat.sub(" : ", rest)  # Clean " . :" or ".. :" -> " : "
+            rest = self.lead_colon_pat.sub("", rest)  # Remove leading colon with spaces (malformed like ": Sardinia France")
+            rest = self.colon_space_pat.sub(" : ", rest)  # Normalize colon spacing
             rest = rest.strip()
             
             if ":" in rest:
                 # Colon already present, normalize spacing and split
-                colon_parts = rest.split(":", 1)
-                if len(colon_parts) == 2:
-                    first_part = colon_parts[0].strip()
-                    second_part = colon_parts[1].strip()
-                    # If first part is empty (malformed like ": Sardinia France"), split second part
-                    if not first_part and second_part:
-                        second_words = second_part.split()
-                        if len(second_words) >= 2:
-                            formatted_pair = f"{roman}. {second_words[0]} : {' '.join(second_words[1:])}"
-                        else:
-                            formatted_pair = f"{roman}. {second_part}"
+                first_part, _, second_part = rest.partition(":")
+                first_part = first_part.strip()
+                second_part = second_part.strip()
+                # If first part is empty (malformed like ": Sardinia France"), split second part
+                if not first_part and second_part:
+                    second_words = second_part.split()
+                    if len(second_words) >= 2:
+                        formatted_pair = self._pair(roman, second_words)
                     else:
-                        formatted_pair = f"{roman}. {first_part} : {second_part}"
+                        formatted_pair = f"{roman}. {second_part}"
                 else:
-                    formatted_pair = f"{roman}. {rest}".replace(" :", " :").replace(": ", " : ")
+                    formatted_pair = f"{roman}. {first_part} : {second_part}"
             else:
                 # No colon - add it
                 words = rest.split()
                 if len(words) >= 2:
                     # Split into two parts - usually first word is first item, rest is second item
-                    first_item = words[0]
-                    second_item = " ".join(words[1:])
-                    formatted_pair = f"{roman}. {first_item} : {second_item}"
+                    formatted_pair = self._pair(roman, words)
                 else:
                     formatted_pair = f"{roman}. {rest}"
             
-            parts.append(("pair", formatted_pair))
+            pairs.append(formatted_pair)
         
         # If we didn't find question text marker, look for it after the last pair
         if question_start_idx is None and matches:
@@ -230,11 +270,7 @@ class MatchFormatter:
             
             # Check if there's orphaned pair text (text that should be a pair but missing Roman numeral)
             # Look for question markers in remaining text
-            question_match = re.search(
-                r"(in\s+how\s+many|how\s+many\s+of\s+the|in\s+which|which\s+of\s+the|what)",
-                remaining_text,
-                re.IGNORECASE
-            )
+            question_match = self.question_marker_pat.search(remaining_text)
             
             if question_match:
                 # There's question text - check if there's pair text before it
@@ -244,75 +280,91 @@ class MatchFormatter:
                 if text_before_question:
                     words = text_before_question.split()
                     # If it looks like a pair (has 2+ words and doesn't start with question words)
-                    if len(words) >= 2 and not re.match(r"^(in|how|which|what|when|where)", text_before_question, re.IGNORECASE):
+                    if len(words) >= 2 and not self.question_word_pat.match(text_before_question):
                         # This is likely a missing pair - determine which Roman numeral it should be
                         # Count existing pairs and add the next one
-                        existing_pairs = [p for p in parts if p[0] == "pair"]
-                        next_roman = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X"][len(existing_pairs)]
+                        next_roman = self.romans[len(pairs)]
                         
                         # Format as pair
                         if ":" not in text_before_question:
-                            first_item = words[0]
-                            second_item = " ".join(words[1:])
-                            formatted_pair = f"{next_roman}. {first_item} : {second_item}"
+                            formatted_pair = self._pair(next_roman, words)
                         else:
-                            formatted_pair = f"{next_roman}. {text_before_question}".replace(" :", " :").replace(": ", " : ")
+                            formatted_pair = f"{next_roman}. {text_before_question}".replace(": ", " : ")
                         
-                        parts.append(("pair", formatted_pair))
+                        pairs.append(formatted_pair)
                 
                 # Extract question text
                 question_text = remaining_text[question_match.start():].strip()
                 # Remove any trailing options that might be there
-                question_text = re.sub(r"\s*\(?[a-eA-E]\)\s+.*$", "", question_text, flags=re.IGNORECASE)
+                question_text = self.option_tail_pat.sub("", question_text)
                 if question_text:
-                    parts.append(("question", question_text))
+                    questions.append(question_text)
             else:
                 # No clear question marker, but if there's remaining text, it might be the question
                 if remaining_text:
                     # Check if remaining text looks like a pair or question
                     words = remaining_text.split()
-                    if len(words) >= 2 and not re.match(r"^(in|how|which|what|when|where)", remaining_text, re.IGNORECASE):
+                    if len(words) >= 2 and not self.question_word_pat.match(remaining_text):
                         # Might be a missing pair
-                        existing_pairs = [p for p in parts if p[0] == "pair"]
-                        if len(existing_pairs) < 3:  # Only add if we don't have many pairs already
-                            next_roman = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X"][len(existing_pairs)]
+                        if len(pairs) < 3:  # Only add if we don't have many pairs already
+                            next_roman = self.romans[len(pairs)]
                             if ":" not in remaining_text:
-                                first_item = words[0]
-                                second_item = " ".join(words[1:])
-                                formatted_pair = f"{next_roman}. {first_item} : {second_item}"
+                                formatted_pair = self._pair(next_roman, words)
                             else:
-                                formatted_pair = f"{next_roman}. {remaining_text}".replace(" :", " :").replace(": ", " : ")
-                            parts.append(("pair", formatted_pair))
+                                formatted_pair = f"{next_roman}. {remaining_text}".replace(": ", " : ")
+                            pairs.append(formatted_pair)
                     else:
                         # Remove options and treat as question
-                        remaining_text = re.sub(r"\s*\(?[a-eA-E]\)\s+.*$", "", remaining_text, flags=re.IGNORECASE)
+                        remaining_text = self.option_tail_pat.sub("", remaining_text)
                         if remaining_text.strip():
-                            parts.append(("question", remaining_text.strip()))
+                            questions.append(remaining_text.strip())
         
-        # Step 4: Reconstruct formatted text
-        result_parts = []
-        header_parts = [p[1] for p in parts if p[0] == "header"]
-        pair_parts = [p[1] for p in parts if p[0] == "pair"]
-        question_parts = [p[1] for p in parts if p[0] == "question"]
+        # Step 4: Reconstruct formatted text (header, pairs, question)
+        # Joining every line at once matches joining each section first:
+        # sections are only added when non-empty
+        lines = [header] if header else []
+        lines += pairs
+        lines += questions
         
-        if header_parts:
-            result_parts.append("\n".join(header_parts))
-        if pair_parts:
-            result_parts.append("\n".join(pair_parts))
-        if question_parts:
-            result_parts.append("\n".join(question_parts))
+        result = "\n".join(lines)
         
-        result = "\n".join(result_parts)
-        
-        # Step 5: Final cleanup
-        result = re.sub(r" {2,}", " ", result)  # Multiple spaces to single space
-        result = re.sub(r"\n{3,}", "\n\n", result)  # Multiple newlines to max 2
-        result = re.sub(r" \n", "\n", result)  # Remove trailing spaces before newlines
-        result = re.sub(r"\n ", "\n", result)  # Remove leading spaces after newlines
+        # Step 5: Final cleanup (substring tests skip clean text)
+        if "  " in result:
+            result = self.multi_space_pat.sub(" ", result)  # Multiple spaces to single space
+        if "\n\n\n" in result:
+            result = self.multi_nl_pat.sub("\n\n", result)  # Multiple newlines to max 2
+        result = self.space_nl_pat.sub("\n", result)  # Remove spaces before / after newlines
         
         return result.strip()
 
 
+def _ascii_pat(pat):
+    """Same pattern compiled with re.ASCII."""
+    return re.compile(pat.pattern, (pat.flags & ~re.UNICODE) | re.ASCII)
+
+
+class _AsciiMatchFormatter(MatchFormatter):
+    """MatchFormatter for ASCII-only text (patterns compiled with re.ASCII)."""
+
+    ascii_only = True
+
+    option_tail_pat = _ascii_pat(MatchFormatter.option_tail_pat)
+    consider_pat = _ascii_pat(MatchFormatter.consider_pat)
+    roman_pat = _ascii_pat(MatchFormatter.roman_pat)
+    question_pats = tuple(_ascii_pat(p) for p in MatchFormatter.question_pats)
+    question_marker_pat = _ascii_pat(MatchFormatter.question_marker_pat)
+    question_word_pat = _ascii_pat(MatchFormatter.question_word_pat)
+    dot_colon_pat = _ascii_pat(MatchFormatter.dot_colon_pat)
+    lead_colon_pat = _ascii_pat(MatchFormatter.lead_colon_pat)
+    colon_space_pat = _ascii_pat(MatchFormatter.colon_space_pat)
+
+
+_ASCII_FORMATTER = _AsciiMatchFormatter()
+
+# convenience function (the formatter holds no state, one is enough)
+_FORMATTER = MatchFormatter()
+
+
 def format_match_question(text: str) -> str:
     """
     Convenience function to format match questions.
@@ -323,6 +375,5 @@ def format_match_question(text: str) -> str:
     Returns:
         Formatted text with proper line breaks
     """
-    formatter = MatchFormatter()
-    return formatter.format(text)
+    return _FORMATTER.format(text)
 
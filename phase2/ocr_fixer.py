@@ -8,18 +8,27 @@ import re
 
 class SafeOCRFixer:
 
+    # (broken prefix, fixed prefix)
+    # "ll the " needs no rule of its own: "ll " already gives "All the "
+    prefix_fixes = (
+        ("ll ", "All "),     # Missing "A" in "All"
+        ("oth ", "Both "),   # Missing "B" in "Both"
+    )
+    broken_prefixes = tuple(broken for broken, _ in prefix_fixes)
+
     def fix_option(self, option_text: str):
+        """
+        Returns the SAME string object when nothing needs fixing,
+        so callers can skip the write with an `is` check.
+        """
         t = option_text
 
-        # Missing "A" in "All"
-        if t.startswith("ll "):
-            return "All " + t[3:]
-
-        if t.startswith("ll the "):
-            return "All the " + t[7:]
+        # one startswith call rejects almost every option
+        if not t.startswith(self.broken_prefixes):
+            return t
 
-        # Missing "B" in "Both"
-        if t.startswith("oth "):
-            return "Both " + t[4:]
+        for broken, fixed in self.prefix_fixes:
+            if t.startswith(broken):
+                return fixed + t[len(broken):]
 
         return t
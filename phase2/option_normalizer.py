@@ -15,6 +15,10 @@ class OptionNormalizer:
 
     # Patterns like (a), a), A), (A), A.
     option_label_pat = re.compile(r"^[\(\[]?\s*([a-eA-E])[\)\.\]]?\s*", re.IGNORECASE)
+    # Same label as an OCR prefix inside the option text
+    option_prefix_pat = re.compile(r"^[\(\[]?\s*[a-eA-E][\)\.\]]?\s*")
+
+    letters = ("A", "B", "C", "D", "E")
 
     def normalize(self, options_dict):
         """
@@ -44,7 +48,7 @@ class OptionNormalizer:
 
         # Sort by letter
         final = {}
-        for letter in ["A", "B", "C", "D", "E"]:
+        for letter in self.letters:
             if letter in cleaned:
                 final[letter] = cleaned[letter]
 
@@ -59,10 +63,13 @@ class OptionNormalizer:
             return ""
 
         v = value.strip()
-        v = re.sub(r"^[\(\[]?\s*[a-eA-E][\)\.\]]?\s*", "", v)
+        v = self.option_prefix_pat.sub("", v)
         return v
 
 
-# convenience function
+# convenience function (the normalizer holds no state, one is enough)
+_NORMALIZER = OptionNormalizer()
+
+
 def normalize_options(options_dict):
-    return OptionNormalizer().normalize(options_dict)
+    return _NORMALIZER.normalize(options_dict)
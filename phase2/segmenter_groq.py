@@ -12,6 +12,11 @@ import os
 import json
 from groq import Groq
 
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json
+    orjson = None
+
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -27,6 +32,12 @@ if not API_KEY:
 
 client = Groq(api_key=API_KEY)
 
+# Raw responses are logged here; created once at import
+LOG_DIR = "logs/groq_segment_raw"
+os.makedirs(LOG_DIR, exist_ok=True)
+
+_TAG_TRANS = str.maketrans({"/": "_", "\\": "_"})
+
 
 class ColumnSegmenter:
 
@@ -62,12 +73,10 @@ class ColumnSegmenter:
 
 
     def _log_raw(self, tag, content):
-        os.makedirs("logs/groq_segment_raw", exist_ok=True)
-
         # sanitize tag
-        safe = tag.replace("/", "_").replace("\\", "_")
+        safe = tag.translate(_TAG_TRANS)
 
-        path = f"logs/groq_segment_raw/{safe}.txt"
+        path = f"{LOG_DIR}/{safe}.txt"
 
         with open(path, "w", encoding="utf-8") as f:
             f.write(content)
@@ -82,8 +91,17 @@ class ColumnSegmenter:
         if start == -1 or end == -1:
             return []
 
+        json_str = s[start:end + 1]
+
+        if orjson is not None:
+            try:
+                arr = orjson.loads(json_str)
+                return arr if isinstance(arr, list) else []
+            except orjson.JSONDecodeError:
+                pass  # NaN, lone surrogates: stdlib is more lenient
+
         try:
-            arr = json.loads(s[start:end + 1])
+            arr = json.loads(json_str)
             if isinstance(arr, list):
                 return arr
             return []
@@ -91,5 +109,9 @@ class ColumnSegmenter:
             return []
 
 
+# convenience function (the segmenter holds no per-call state, one is enough)
+_SEGMENTER = ColumnSegmenter()
+
+
 def segment_column(text: str, tag: str):
-    return ColumnSegmenter().segment(text, tag)
+    return _SEGMENTER.segment(text, tag)
@@ -8,6 +8,9 @@ import re
 
 class TableFormatter:
 
+    # a pipe with the whitespace around it (never crossing a line)
+    pipe_pat = re.compile(r"[^\S\n]*\|[^\S\n]*")
+
     def format(self, text: str):
         """
         Format table question text with proper line breaks and structure.
@@ -17,15 +20,13 @@ class TableFormatter:
             return text
         
         # If text has pipes, normalize spacing
+        # (stripping the line covers the outer edges of its first
+        # and last cells; the regex handles every pipe in between)
         if "|" in text:
-            lines = text.split("\n")
-            out = []
-            for ln in lines:
-                if "|" in ln:
-                    cols = [c.strip() for c in ln.split("|")]
-                    out.append(" | ".join(cols))
-                else:
-                    out.append(ln)
+            out = [
+                self.pipe_pat.sub(" | ", ln.strip()) if "|" in ln else ln
+                for ln in text.split("\n")
+            ]
             return "\n".join(out)
         
         # No pipes - return as-is (don't try to reconstruct)
@@ -0,0 +1,31 @@
+# run_all.py
+# ---------------------------------------------------------
+# Phase 1 (OCR) and Phase 2 (dataset build) in one run:
+# each PDF's dataset is built while later PDFs are still
+# being OCR'd, instead of after the whole corpus.
+# ---------------------------------------------------------
+
+from concurrent.futures import ThreadPoolExecutor
+
+from run_extract import run_all_pdfs
+from run_phase2 import run_pdf
+
+
+def run(max_workers=None):
+    # Phase 2 is mostly waiting on the Groq API: one thread, in this
+    # process, builds the finished PDFs in order (its own asyncio fanout
+    # keeps the requests concurrent).
+    with ThreadPoolExecutor(max_workers=1) as phase2:
+        builds = []
+
+        def on_done(pdf_name):
+            builds.append(phase2.submit(run_pdf, pdf_name))
+
+        run_all_pdfs(max_workers=max_workers, on_done=on_done)
+
+        for build in builds:
+            build.result()
+
+
+if __name__ == "__main__":
+    run()
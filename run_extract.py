@@ -5,13 +5,29 @@
 # ---------------------------------------------------------
 
 import os
+import re
 import glob
+import argparse
 import shutil
+import queue
+import multiprocessing
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from utils.pdf_converter import pdf_to_images
-from layout.column_splitter import split_into_columns
+from layout.column_splitter import split_page
 from ocr.easyocr_engine import OCREngine
 from ocr.post_cleaner import clean_ocr_block
 
+# Rasterization DPI: 300 is enough for OCR; --high-res renders at 600
+DPI = 300
+HIGH_RES_DPI = 600
+
+# Columns handed to EasyOCR per readtext_batched call (at most)
+OCR_BATCH = 8
+
+# Column arrays waiting for OCR (bounds memory: ~10 MB each at 300 DPI)
+MAX_PENDING_COLUMNS = 2 * OCR_BATCH
+
 
 def ensure_dirs():
     os.makedirs("output/images", exist_ok=True)
@@ -19,25 +35,48 @@ def ensure_dirs():
     os.makedirs("output/ocr_raw", exist_ok=True)
     os.makedirs("output/ocr_clean", exist_ok=True)
 
-def clean_output_dirs():
-    folders = [
-        "output/images",
-        "output/columns",
-        "output/ocr_raw",
-        "output/ocr_clean",
-        "logs/groq_segment_raw"
-    ]
-
-    for folder in folders:
-        if os.path.exists(folder):
+OUTPUT_DIRS = (
+    "output/images",
+    "output/columns",
+    "output/ocr_raw",
+    "output/ocr_clean",
+    "logs/groq_segment_raw",
+)
+
+
+def _outputs_pat(bases):
+    # output/images/<base>/, <base>_pN (columns), <base>_pN_cM.txt (OCR, logs);
+    # exact names only, so "UPSC" never claims "UPSC_paper2"'s outputs
+    alts = "|".join(map(re.escape, bases))
+    return re.compile(rf"(?:{alts})(?:_p\d+(?:_c\d+\.txt)?)?")
+
+
+def clean_output_dirs(pdf_bases=None):
+    """
+    pdf_bases=None wipes every output folder. Otherwise only the
+    entries of those PDFs are removed (one scandir per folder), and
+    other PDFs' outputs are kept.
+    """
+    owned = _outputs_pat(pdf_bases) if pdf_bases else None
+
+    for folder in OUTPUT_DIRS:
+        if pdf_bases is None:
             shutil.rmtree(folder, ignore_errors=True)
 
-    # recreate directories
-    os.makedirs("output/images", exist_ok=True)
-    os.makedirs("output/columns", exist_ok=True)
-    os.makedirs("output/ocr_raw", exist_ok=True)
-    os.makedirs("output/ocr_clean", exist_ok=True)
-    os.makedirs("logs/groq_segment_raw", exist_ok=True)
+        # recreate directories
+        os.makedirs(folder, exist_ok=True)
+
+        if owned is None:
+            continue
+
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if not owned.fullmatch(entry.name):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                else:
+                    os.unlink(entry.path)
 
 def parse_filename(pdf_name):
     """
@@ -58,63 +97,191 @@ def parse_filename(pdf_name):
     return exam, year
 
 
-def process_pdf(pdf_name):
-    print(f"\n==============================")
-    print(f"[PHASE 1] Processing → {pdf_name}")
-    print("==============================")
+def _rasterize_stage(pdf_path, base, q_pages, dpi):
+    """Stage 1: PDF → page images, pushed as (page_idx, img_path)."""
+    try:
+        imgs = pdf_to_images(pdf_path, f"output/images/{base}", dpi=dpi)
+        for page_idx, img in enumerate(imgs, start=1):
+            q_pages.put((page_idx, img))
+    finally:
+        q_pages.put(None)   # end of stream, also on error
 
-    exam, year = parse_filename(pdf_name)
 
-    ensure_dirs()
+def _split_stage(base, q_pages, q_cols, dump_columns):
+    """Stage 2: page image → column arrays, pushed as (page_idx, col_idx, col_img)."""
+    try:
+        for page_idx, img in iter(q_pages.get, None):
+            # columns go to OCR in memory; PNGs only when asked for
+            col_folder = f"output/columns/{base}_p{page_idx}" if dump_columns else None
 
-    pdf_path = f"input_pdfs/{pdf_name}"
-    imgs = pdf_to_images(pdf_path, "output/images", dpi=600)
+            columns = split_page(img, col_folder)
 
-    ocr = OCREngine()
+            for col_idx, col_img in enumerate(columns, start=1):
+                q_cols.put((page_idx, col_idx, col_img))
+    finally:
+        q_cols.put(None)
+
+
+def _ocr_columns(ocr, pdf_name, exam, year, columns):
+    """Stage 3: OCR a batch of (page_idx, col_idx, col_img) and write raw/clean text."""
+    for page_idx, col_idx, _ in columns:
+        print(f"[OCR] {pdf_name} → Page {page_idx} Column {col_idx}")
 
-    for page_idx, img in enumerate(imgs, start=1):
+    raws = ocr.extract_text_batch([col_img for _, _, col_img in columns])
 
-        col_folder = f"output/columns/{exam}_p{page_idx}"
-        os.makedirs(col_folder, exist_ok=True)
+    for (page_idx, col_idx, _), raw in zip(columns, raws):
+        clean = clean_ocr_block(raw)
 
-        columns = split_into_columns(img, col_folder)
+        # meta_tag should include exam + year if available
+        if year:
+            meta_tag = f"{exam}_{year}_p{page_idx}_c{col_idx}"
+        else:
+            meta_tag = f"{exam}_p{page_idx}_c{col_idx}"
 
-        for col_idx, col_img in enumerate(columns, start=1):
+        with open(f"output/ocr_raw/{meta_tag}.txt", "w", encoding="utf-8") as f:
+            f.write(raw)
 
-            print(f"[OCR] {pdf_name} → Page {page_idx} Column {col_idx}")
+        with open(f"output/ocr_clean/{meta_tag}.txt", "w", encoding="utf-8") as f:
+            f.write(clean)
+
+
+def process_pdf(pdf_name, dpi=DPI, dump_columns=False):
+    print(f"\n==============================")
+    print(f"[PHASE 1] Processing → {pdf_name}")
+    print("==============================")
+
+    exam, year = parse_filename(pdf_name)
+    base = pdf_name.replace(".pdf", "")
 
-            raw = ocr.extract_text(col_img)
-            clean = clean_ocr_block(raw)
+    ensure_dirs()
 
-            # meta_tag should include exam + year if available
-            if year:
-                meta_tag = f"{exam}_{year}_p{page_idx}_c{col_idx}"
-            else:
-                meta_tag = f"{exam}_p{page_idx}_c{col_idx}"
+    # per-PDF folders so parallel workers never overwrite each other's pages
+    pdf_path = f"input_pdfs/{pdf_name}"
 
-            with open(f"output/ocr_raw/{meta_tag}.txt", "w", encoding="utf-8") as f:
-                f.write(raw)
+    ocr = OCREngine()
 
-            with open(f"output/ocr_clean/{meta_tag}.txt", "w", encoding="utf-8") as f:
-                f.write(clean)
+    # Rasterize → split → OCR run as a pipeline: pages and columns
+    # flow to OCR as soon as they exist. Pages travel as paths
+    # (unbounded queue); columns as arrays, so that queue is bounded.
+    q_pages = queue.Queue()
+    q_cols = queue.Queue(maxsize=MAX_PENDING_COLUMNS)
+
+    with ThreadPoolExecutor(max_workers=2) as stages:
+        rasterize = stages.submit(_rasterize_stage, pdf_path, base, q_pages, dpi)
+        split = stages.submit(_split_stage, base, q_pages, q_cols, dump_columns)
+
+        # Stage 3 (this thread owns the OCR model): columns are OCR'd
+        # in batches of whatever is ready, up to OCR_BATCH at a time
+        try:
+            pending = []
+            for item in iter(q_cols.get, None):
+                pending.append(item)
+                if len(pending) >= OCR_BATCH or q_cols.empty():
+                    _ocr_columns(ocr, pdf_name, exam, year, pending)
+                    pending = []
+
+            if pending:
+                _ocr_columns(ocr, pdf_name, exam, year, pending)
+        except BaseException:
+            # OCR failed: drain the columns so the split stage is not
+            # left blocked on a full queue
+            for _ in iter(q_cols.get, None):
+                pass
+            raise
+
+        # re-raise a stage failure instead of reporting a partial PDF
+        rasterize.result()
+        split.result()
 
     print(f"[PHASE 1 COMPLETE] OCR generated for {pdf_name}")
 
 
-def run_all_pdfs():
-    # CLEAN OUTPUT FIRST
-    clean_output_dirs()
+def _init_worker():
+    # Load the OCR model once per worker, before any PDF arrives
+    OCREngine()
 
+
+def run_all_pdfs(max_workers=None, dpi=DPI, dump_columns=False, on_done=None):
+    """
+    OCR every PDF in input_pdfs/. on_done(pdf_name), if given, is
+    called in this process as soon as each PDF's OCR files are written.
+    """
     pdf_files = sorted(glob.glob("input_pdfs/*.pdf"))
 
     if not pdf_files:
+        # CLEAN OUTPUT (nothing to keep)
+        clean_output_dirs()
         print("[ERROR] No PDF files found in input_pdfs/")
         return
 
-    for pdf in pdf_files:
-        pdf_name = os.path.basename(pdf)
-        process_pdf(pdf_name)
+    pdf_names = [os.path.basename(pdf) for pdf in pdf_files]
+
+    # CLEAN OUTPUT FIRST (only these PDFs' previous results)
+    clean_output_dirs([name.replace(".pdf", "") for name in pdf_names])
+
+    if max_workers is None:
+        max_workers = max(1, (os.cpu_count() or 2) // 2)
+    max_workers = min(max_workers, len(pdf_names))
+
+    if max_workers == 1:
+        for pdf_name in pdf_names:
+            process_pdf(pdf_name, dpi, dump_columns)
+            if on_done:
+                on_done(pdf_name)
+        return
+
+    # Split the cores between workers: each spawned worker imports
+    # torch / OpenMP afresh and inherits these limits, instead of
+    # every worker starting one thread per core. Set before the pool
+    # starts; values already in the environment win.
+    threads = str(max(1, (os.cpu_count() or 1) // max_workers))
+    for var in ("OMP_NUM_THREADS", "OMP_THREAD_LIMIT", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ.setdefault(var, threads)
+
+    # OCR is independent per PDF → one worker process per PDF.
+    # "spawn" avoids inheriting CUDA / model state through fork.
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker
+    ) as pool:
+        worker = partial(process_pdf, dpi=dpi, dump_columns=dump_columns)
+        futures = {pool.submit(worker, pdf_name): pdf_name for pdf_name in pdf_names}
+
+        for future in as_completed(futures):
+            future.result()
+            if on_done:
+                on_done(futures[future])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Phase 1: OCR every PDF in input_pdfs/"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes, one PDF each (default: half the CPU count)"
+    )
+    parser.add_argument(
+        "--high-res",
+        action="store_true",
+        help=f"Rasterize pages at {HIGH_RES_DPI} DPI instead of {DPI}"
+    )
+    parser.add_argument(
+        "--dump-columns",
+        action="store_true",
+        help="Also save column images under output/columns/ (debugging)"
+    )
+    args = parser.parse_args()
+
+    run_all_pdfs(
+        max_workers=args.workers,
+        dpi=HIGH_RES_DPI if args.high_res else DPI,
+        dump_columns=args.dump_columns
+    )
 
 
 if __name__ == "__main__":
-    run_all_pdfs()
+    main()
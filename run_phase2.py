@@ -6,10 +6,11 @@
 
 import glob
 import os
-from phase2.dataset_builder import build_dataset
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from phase2.dataset_builder import build_dataset, GROQ_NUM_PARALLEL
 
 
-def run():
+def run(max_workers=None):
     # -----------------------------------------------------
     # STEP 1: Find all PDFs in input_pdfs/
     # -----------------------------------------------------
@@ -20,36 +21,91 @@ def run():
         return
 
     # -----------------------------------------------------
-    # STEP 2: For each PDF → process its OCR blocks
+    # STEP 2: For each PDF → collect its OCR blocks
     # -----------------------------------------------------
+    jobs = []
     for pdf_path in pdf_files:
         pdf_name = os.path.basename(pdf_path)           # UPSC_2025.pdf
-        base_name = pdf_name.replace(".pdf", "")        # UPSC_2025
 
-        print(f"\n============================")
-        print(f"[PHASE 2] Processing PDF :  {pdf_name}")
-        print(f"============================")
+        job = _pdf_job(pdf_name)
+        if job:
+            jobs.append((pdf_name, *job))
 
-        # OCR files created in Phase 1: UPSC_2025_p1_c1.txt etc.
-        pattern = f"output/ocr_raw/{base_name}_*.txt"
-        ocr_files = sorted(glob.glob(pattern))
+    if not jobs:
+        return
+
+    # -----------------------------------------------------
+    # STEP 3: Build one dataset JSON per PDF
+    # -----------------------------------------------------
+    # PDFs are independent → one worker process per PDF; the CPUs
+    # and the GROQ_NUM_PARALLEL request budget are split between
+    # them. At most GROQ_NUM_PARALLEL workers, so each gets at least
+    # one request slot and in-flight LLM calls stay within the budget.
+    cpus = os.cpu_count() or 1
+    if max_workers is None:
+        max_workers = cpus
+    max_workers = min(max_workers, len(jobs), GROQ_NUM_PARALLEL)
+    column_workers = max(1, cpus // max_workers)
+    num_parallel = GROQ_NUM_PARALLEL // max_workers
+
+    if max_workers == 1:
+        for pdf_name, ocr_files, output_json in jobs:
+            _build_pdf(pdf_name, ocr_files, output_json, column_workers, num_parallel)
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(
+                _build_pdf, pdf_name, ocr_files, output_json, column_workers, num_parallel
+            ): pdf_name
+            for pdf_name, ocr_files, output_json in jobs
+        }
+
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                print(f"[FAIL] {futures[future]}: {e}")
+
+
+def run_pdf(pdf_name, column_workers=1, num_parallel=None):
+    """Build the dataset JSON of ONE PDF whose OCR files are ready."""
+    job = _pdf_job(pdf_name)
+    if job:
+        _build_pdf(pdf_name, *job, column_workers, num_parallel)
+
+
+def _pdf_job(pdf_name):
+    """(ocr_files, output_json) for a PDF, or None without OCR files."""
+    base_name = pdf_name.replace(".pdf", "")        # UPSC_2025
+
+    # OCR files created in Phase 1: UPSC_2025_p1_c1.txt etc.
+    pattern = f"output/ocr_raw/{base_name}_*.txt"
+    ocr_files = sorted(glob.glob(pattern))
+
+    if not ocr_files:
+        print(f"[WARNING] No OCR files found for: {pdf_name}")
+        return None
+
+    # Output JSON path
+    output_json = f"output/{base_name}.json"
+
+    return ocr_files, output_json
 
-        if not ocr_files:
-            print(f"[WARNING] No OCR files found for: {pdf_name}")
-            continue
 
-        # Output JSON path
-        output_json = f"output/{base_name}.json"
+def _build_pdf(pdf_name, ocr_files, output_json, column_workers, num_parallel=None):
+    print(f"\n============================")
+    print(f"[PHASE 2] Processing PDF :  {pdf_name}")
+    print(f"============================")
 
-        # -----------------------------------------------------
-        # STEP 3: Build dataset JSON for this specific PDF
-        # -----------------------------------------------------
-        build_dataset(
-            ocr_files=ocr_files,
-            output_file=output_json
-        )
+    build_dataset(
+        ocr_files=ocr_files,
+        output_file=output_json,
+        max_workers=column_workers,   # one process per OCR column
+        num_parallel=num_parallel     # this PDF's share of GROQ_NUM_PARALLEL
+    )
 
-        print(f"[DONE] Saved  :  {output_json}")
+    print(f"[DONE] Saved  :  {output_json}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,44 @@
+# tests/test_merge_json_to_csv.py
+
+from merge_json_to_csv import _CSV_COLS, CsvRowWriter, _tail_last_id, read_last_id
+
+
+def _row(row_id, question="Which of the following is correct?"):
+    row = [""] * len(_CSV_COLS)
+    row[0] = str(row_id)
+    row[2] = question
+    return row
+
+
+def _write(path, rows, pretty_format=False):
+    writer = CsvRowWriter(path, pretty_format=pretty_format)
+    writer.write_rows(rows)
+    writer.close()
+
+
+def test_tail_ignores_quoted_line_that_looks_like_a_row(tmp_path):
+    # the last question's final line starts with "1, ": read from there it
+    # splits into three fields and, with the columns after it, one full row
+    question = "Which of the statements given above are correct?\n1, 2, and 3 only"
+    for pretty_format in (False, True):
+        path = tmp_path / f"questions_{pretty_format}.csv"
+        _write(path, [_row(i) for i in range(1, 4)] + [_row(4, question)], pretty_format)
+
+        assert _tail_last_id(path) == 4
+        assert read_last_id(path) == 4
+
+
+def test_tail_single_row_confirmed_by_header(tmp_path):
+    path = tmp_path / "questions.csv"
+    _write(path, [_row(7, "Which are correct?\n3, 4, and 5 only")])
+
+    assert _tail_last_id(path) == 7
+
+
+def test_unconfirmed_tail_falls_back_to_full_scan(tmp_path):
+    path = tmp_path / "questions.csv"
+    _write(path, [_row(1), _row(2, "x" * 200 + "\n1, 2, and 3 only")])
+
+    # window too small to reach a confirmed row
+    assert _tail_last_id(path, window=64) is None
+    assert read_last_id(path) == 2
@@ -0,0 +1,43 @@
+# tests/test_run_extract.py
+
+import os
+
+import pytest
+
+# run_extract pulls in the OCR / rasterization stack at import time
+for _dep in ("cv2", "easyocr", "pdf2image"):
+    pytest.importorskip(_dep)
+
+import run_extract
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "w").close()
+
+
+def test_clean_keeps_pdfs_whose_name_extends_the_base(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    mine = [
+        "output/images/UPSC/page_1.png",
+        "output/columns/UPSC_p1/col_1.png",
+        "output/ocr_raw/UPSC_p1_c2.txt",
+        "output/ocr_clean/UPSC_p12_c1.txt",
+        "logs/groq_segment_raw/UPSC_p3_c1.txt",
+    ]
+    # same prefix, different PDFs ("UPSC_paper2.pdf", "UPSC_prelims_2024.pdf")
+    others = [
+        "output/images/UPSC_paper2/page_1.png",
+        "output/columns/UPSC_paper2_p1/col_1.png",
+        "output/ocr_raw/UPSC_prelims_2024_p1_c1.txt",
+        "output/ocr_clean/UPSC_p1x_c1.txt",
+        "logs/groq_segment_raw/UPSC_paper2_p1_c1.txt",
+    ]
+    for path in mine + others:
+        _touch(path)
+
+    run_extract.clean_output_dirs(["UPSC"])
+
+    assert not any(os.path.exists(p) for p in mine)
+    assert all(os.path.exists(p) for p in others)
@@ -8,12 +8,17 @@
 
 import re
 
+# Bullet glyphs OCR picks up from list markers
+_BULLETS_PAT = re.compile(r"[•●■▪▫]")
+
+
 def normalize(text: str) -> str:
     if not text:
         return ""
 
-    text = text.replace("\u00A0", " ").replace("\u200B", "")
-    text = re.sub(r"[•●■▪▫]", "", text)
+    # every character rewritten below is non-ASCII
+    if not text.isascii():
+        text = text.replace("\u00A0", " ").replace("\u200B", "")
+        text = _BULLETS_PAT.sub("", text)
 
-    lines = [ln.strip() for ln in text.split("\n") if ln.strip()]
-    return "\n".join(lines)
+    return "\n".join(filter(None, map(str.strip, text.split("\n"))))
@@ -1,20 +1,50 @@
 # utils/pdf_converter.py
 
 import os
-from pdf2image import convert_from_path
+from concurrent.futures import ThreadPoolExecutor
+from pdf2image import convert_from_path, pdfinfo_from_path
 
-def pdf_to_images(pdf_path, output_folder, dpi=600):
+
+def _render_page(pdf_path, output_folder, dpi, page):
+    # pdftoppm writes the PNG itself: no PIL image is held in memory
+    return convert_from_path(
+        pdf_path,
+        dpi=dpi,
+        first_page=page,
+        last_page=page,
+        output_folder=output_folder,
+        output_file=f"page_{page}",
+        single_file=True,
+        fmt="png",
+        paths_only=True,
+    )[0]
+
+
+def pdf_to_images(pdf_path, output_folder, dpi=300, max_workers=None, pages=None):
+    """
+    Yields page image paths (page_1.png, page_2.png, ...) in page order
+    as soon as each page is rendered. Pages render in parallel, one
+    pdftoppm process each.
+
+    pages: 1-based page numbers to render (default: all pages).
+    300 DPI is enough for OCR; 600 DPI moves 4x the pixels.
+    """
     os.makedirs(output_folder, exist_ok=True)
 
     print(f"[PDF] Converting '{pdf_path}' to images at {dpi} DPI...")
 
-    pages = convert_from_path(pdf_path, dpi=dpi)
+    if pages is None:
+        pages = range(1, pdfinfo_from_path(pdf_path)["Pages"] + 1)
+    pages = list(pages)
+
+    if max_workers is None:
+        max_workers = min(8, os.cpu_count() or 1)
 
-    image_paths = []
-    for i, page in enumerate(pages):
-        out_path = os.path.join(output_folder, f"page_{i+1}.png")
-        page.save(out_path, "PNG")
-        image_paths.append(out_path)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        paths = pool.map(
+            lambda page: _render_page(pdf_path, output_folder, dpi, page),
+            pages
+        )
+        yield from paths
 
-    print(f"[PDF] Extracted {len(image_paths)} page images.")
-    return image_paths
+    print(f"[PDF] Extracted {len(pages)} page images.")
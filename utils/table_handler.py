@@ -30,7 +30,7 @@ def flatten_table_rows(rows):
     flattened = []
     for row in rows:
         # Split columns using '|'
-        parts = [p.strip() for p in row.split("|") if p.strip()]
+        parts = list(filter(None, map(str.strip, row.split("|"))))
 
         if not parts:
             continue
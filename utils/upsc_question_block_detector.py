@@ -13,46 +13,53 @@ class UPSCQuestionBlockDetector:
     digit_list_pat = re.compile(r"^\d+\s*[\.\)]\s+")
     table_pat = re.compile(r"[A-Za-z0-9]+\s*\|\s*[A-Za-z0-9]+")
 
-    likely_q_start = [
-        r"^with reference",
-        r"^consider the following",
-        r"^which of the following",
-        r"^which one of the following",
-        r"^assertion",
-        r"^read the following",
-        r"^regarding",
-        r"^in the context",
-        r"^who among the following",
-        r"^identify the correct",
-        r"^identify which",
-    ]
-
-    compiled_starts = [re.compile(p, re.IGNORECASE) for p in likely_q_start]
+    # matched against the lowercased line, so no IGNORECASE needed
+    numeric_start_pat = re.compile(r"^\d+\.")
+    wh_start_pat = re.compile(r"^(which|what|when|where|who|identify)\b")
+
+    # lowercase prefixes; one str.startswith call checks them all
+    likely_q_start = (
+        "with reference",
+        "consider the following",
+        "which of the following",
+        "which one of the following",
+        "assertion",
+        "read the following",
+        "regarding",
+        "in the context",
+        "who among the following",
+        "identify the correct",
+        "identify which",
+    )
 
     def is_option(self, line: str):
         return bool(self.option_pat.match(line.strip()))
 
-    def is_probable_question_start(self, line: str):
+    def is_probable_question_start(self, line: str, words: int = None):
+        """words: len(line.split()) when the caller already has it."""
         low = line.lower().strip()
 
         # NEVER treat numeric list as question start
-        if re.match(r"^\d+\.", low):
+        if self.numeric_start_pat.match(low):
             return False
 
         if len(low) < 10:
             return False
 
-        if re.match(r"^(which|what|when|where|who|identify)\b", low) and len(low.split()) > 3:
+        if low.startswith(self.likely_q_start):
             return True
 
-        for pat in self.compiled_starts:
-            if pat.match(line):
-                return True
+        # lowercasing never adds or removes whitespace
+        if words is None:
+            words = len(low.split())
 
-        if low.startswith("how many") and len(low.split()) > 3:
+        if self.wh_start_pat.match(low) and words > 3:
             return True
 
-        if low.endswith("?") and len(low.split()) > 4:
+        if low.startswith("how many") and words > 3:
+            return True
+
+        if low.endswith("?") and words > 4:
             return True
 
         return False
@@ -62,47 +69,36 @@ class UPSCQuestionBlockDetector:
         lines = [ln.strip() for ln in text.split("\n") if ln.strip()]
         blocks = []
         curr = []
-
-        for idx, line in enumerate(lines):
-
-            if self.table_pat.search(line):
-                curr.append(line)
-                continue
-
-            if self.digit_list_pat.match(line):
-                curr.append(line)
-                continue
-
-            if self.roman_pat.match(line):
-                curr.append(line)
-                continue
-
-            if self.is_option(line):
-                curr.append(line)
-                continue
-
-            if curr and line[0].islower():
-                curr.append(line)
-                continue
-
-            if curr and len(line.split()) <= 3:
-                curr.append(line)
-                continue
-
-            if self.is_probable_question_start(line):
-
-                if curr and len(" ".join(curr).split()) < 5:
-                    curr.append(line)
-                    continue
-
-                if curr:
-                    blocks.append("\n".join(curr).strip())
-                    curr = []
-
-                curr.append(line)
-                continue
+        curr_words = 0   # == len(" ".join(curr).split())
+
+        for line in lines:
+
+            words = len(line.split())
+
+            # table rows, list items, options and short / lowercase
+            # fragments always continue the current block
+            # ("|" check first: most lines have no pipe, skip the regex)
+            continues = (
+                ("|" in line and self.table_pat.search(line))
+                or self.digit_list_pat.match(line)
+                or self.roman_pat.match(line)
+                or self.is_option(line)
+                or (curr and (line[0].islower() or words <= 3))
+            )
+
+            # a question start closes the current block, unless that
+            # block is still under 5 words
+            if (
+                not continues
+                and curr_words >= 5
+                and self.is_probable_question_start(line, words)
+            ):
+                blocks.append("\n".join(curr).strip())
+                curr = []
+                curr_words = 0
 
             curr.append(line)
+            curr_words += words
 
         if curr:
             blocks.append("\n".join(curr).strip())
@@ -110,5 +106,9 @@ class UPSCQuestionBlockDetector:
         return blocks
 
 
+# convenience function (the detector holds no state, one is enough)
+_DETECTOR = UPSCQuestionBlockDetector()
+
+
 def detect_question_blocks(text: str):
-    return UPSCQuestionBlockDetector().detect(text)
+    return _DETECTOR.detect(text)
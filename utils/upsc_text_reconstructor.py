@@ -11,6 +11,14 @@
 import re
 from utils.table_handler import flatten_table_rows
 
+_ROMANS = frozenset(["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X"])
+
+# option_pat's closing mark and trailing space are optional, so a line
+# is an option exactly when it starts with one of these
+_OPTION_PREFIXES = tuple(
+    p + letter for letter in "abcdeABCDE" for p in ("", "(", "[")
+)
+
 
 class UPSCTextReconstructor:
 
@@ -18,105 +26,141 @@ class UPSCTextReconstructor:
     statement_header_pat = re.compile(r"^statement[\s\-]*([i1]+)[\.\:]*$", re.IGNORECASE)
     numeric_header_pat = re.compile(r"^\d+\.$")
     numeric_item_pat = re.compile(r"^\d+\s*[\.\)]\s+")
-    table_sep_pat = re.compile(r"[|]{1,}")
 
     option_pat = re.compile(r"^[\(\[]?[a-eA-E][\)\.\]]?\s*")
 
+    # One match classifies a line's start for reconstruct():
+    # roman / numeric list items (always their own line) or an option
+    # (same test as option_pat). The alternatives begin with disjoint
+    # characters, so at most one of them can match.
+    line_kind_pat = re.compile(
+        r"(?P<roman>(?:I|II|III|IV|V|VI|VII|VIII|IX|X)\.)"
+        r"|(?P<num>\d+\.)"
+        r"|(?P<opt>[\(\[]?[a-eA-E])"
+    )
+    # first characters line_kind_pat can start with (plus non-ASCII \d)
+    kind_starts = frozenset("IVX0123456789([abcdeABCDE")
+
+    bullet_pat = re.compile(r"[•●■▪▫]")
+    multi_space_pat = re.compile(r" {2,}")
+
     def preprocess(self, text: str):
-        text = text.replace("\u00A0", " ").replace("\u200B", "")
-        text = re.sub(r"[•●■▪▫]", "", text)
-        lines = [ln.strip() for ln in text.split("\n") if ln.strip()]
-        return lines
+        # every character rewritten here is non-ASCII
+        if not text.isascii():
+            text = text.replace("\u00A0", " ").replace("\u200B", "")
+            text = self.bullet_pat.sub("", text)
+        return list(filter(None, map(str.strip, text.split("\n"))))
 
     def is_option(self, line):
-        return bool(self.option_pat.match(line))
+        return line.startswith(_OPTION_PREFIXES)
 
     def is_roman(self, line):
-        return bool(self.roman_pat.match(line))
+        # IGNORECASE also folds a few non-ASCII letters (e.g. "İ" to "I")
+        if not line.isascii():
+            return bool(self.roman_pat.match(line))
+        # same test as roman_pat: one optional "." / ":" after the numeral
+        if line[-1:] in (".", ":"):
+            line = line[:-1]
+        return line.upper() in _ROMANS
 
     def is_statement_header(self, line):
         return bool(self.statement_header_pat.match(line))
 
     def is_numeric_header(self, line):
-        return bool(self.numeric_header_pat.match(line))
+        # same test as numeric_header_pat (\d is str.isdecimal)
+        return line[-1:] == "." and line[:-1].isdecimal()
 
     def is_numeric_item(self, line):
-        return bool(self.numeric_item_pat.match(line))
+        # most lines do not start with a digit (\d is str.isdecimal):
+        # reject those without entering the regex engine
+        return line[:1].isdecimal() and bool(self.numeric_item_pat.match(line))
 
     def is_table_row(self, line):
-        return bool(self.table_sep_pat.search(line))
-
-    def reconstruct(self, text: str):
+        return "|" in line
 
-        lines = self.preprocess(text)
+    def _emit(self, lines):
+        """Yield output lines one at a time (reconstruct joins them)."""
 
-        structured = []
-        buffer = ""
+        buffer = []   # lines of the current paragraph, joined with " " on flush
         table_rows = []
 
-        skip_next = False
+        # bound once: the loop body runs per line
+        match_kind = self.line_kind_pat.match
+        kind_starts = self.kind_starts
 
-        for i, line in enumerate(lines):
+        for line in lines:
 
-            if skip_next:
-                skip_next = False
-                continue
+            # most lines are prose: skip the match when the first
+            # character rules every kind out (lines are non-empty)
+            c = line[0]
+            if c in kind_starts or c.isdecimal():
+                m = match_kind(line)
+                kind = m.lastgroup if m else None
+            else:
+                kind = None
 
             # ----------------------------
             # FORCE NEW LINE FOR LIST ITEMS
             # ----------------------------
-            if re.match(r"^(I|II|III|IV|V|VI|VII|VIII|IX|X)\.", line):
-                structured.append(line)
-                continue
-
-            if re.match(r"^\d+\.", line):
-                structured.append(line)
+            if kind == "roman" or kind == "num":
+                yield line
                 continue
 
             # ----------------------------
             # TABLE ROW COLLECTION
             # ----------------------------
-            if self.is_table_row(line):
+            if "|" in line:   # is_table_row
                 table_rows.append(line)
                 continue
 
             if table_rows:
-                structured.extend(flatten_table_rows(table_rows))
+                yield from flatten_table_rows(table_rows)
                 table_rows = []
 
             # ----------------------------
             # OPTIONS
             # ----------------------------
-            if self.is_option(line):
+            if kind == "opt":
                 if buffer:
-                    structured.append(buffer.strip())
-                    buffer = ""
-                structured.append(line)
+                    yield " ".join(buffer)
+                    buffer = []
+                yield line
                 continue
 
             # ----------------------------
             # NORMAL LINE MERGE
             # ----------------------------
-            if not buffer:
-                buffer = line
-            else:
-                if buffer.endswith((".", "?", "!", ":")):
-                    structured.append(buffer)
-                    buffer = line
-                else:
-                    buffer += " " + line
+            # (lines are stripped and non-empty, so the joined paragraph
+            # needs no strip and ends like its last line)
+            if buffer and buffer[-1].endswith((".", "?", "!", ":")):
+                yield " ".join(buffer)
+                buffer = []
+
+            buffer.append(line)
 
         if buffer:
-            structured.append(buffer.strip())
+            yield " ".join(buffer)
 
         if table_rows:
-            structured.extend(flatten_table_rows(table_rows))
+            yield from flatten_table_rows(table_rows)
+
+    def reconstruct(self, text: str):
+
+        text = "\n".join(self._emit(self.preprocess(text)))
+
+        # space runs never cross a line, so one pass over the joined
+        # text; the substring test skips the (slow) scan when clean
+        if "  " in text:
+            text = self.multi_space_pat.sub(" ", text)
 
-        structured = [re.sub(r" {2,}", " ", s) for s in structured]
+        # every emitted line is stripped and non-empty, so the joined
+        # text has no edge whitespace left to strip
+        return text
 
-        return "\n".join(structured).strip()
 
+# convenience function (the reconstructor holds no state, one is enough)
+_RECONSTRUCTOR = UPSCTextReconstructor()
 
 
 def reconstruct_text(text: str):
-    return UPSCTextReconstructor().reconstruct(text)
+    return _RECONSTRUCTOR.reconstruct(text)